@@ -0,0 +1,58 @@
+"""Bulk construction against registrations one by one, with the
+timings of the phases of the builder.
+
+    python benchmarks/builder.py
+    python benchmarks/builder.py --sizes 1000 10000 --threads 4
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from roughrider.routing.builder import RoutesBuilder
+from roughrider.routing.components import NamedRoutes
+import tables
+
+
+def builder(size: int) -> RoutesBuilder:
+    builder = RoutesBuilder(NamedRoutes())
+    for i, (path, methods, kind) in enumerate(tables.templates(size)):
+        builder.register(path, methods=methods, name=f'route{i}')(
+            tables.endpoint)
+    return builder
+
+
+def report(label: str, elapsed: float, timings=None):
+    line = f'{label:>22}: {elapsed * 1e3:10.1f} ms'
+    if timings is not None:
+        line += ' | ' + ', '.join(
+            f'{phase} {value * 1e3:.1f}'
+            for phase, value in timings._asdict().items())
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+    for size in args.sizes:
+        print(f'## {size} routes')
+        start = time.perf_counter()
+        tables.build(size).freeze()
+        report('register + freeze', time.perf_counter() - start)
+        for label, freeze, threads in (
+                ('build', False, 0),
+                ('build frozen', True, 0),
+                ('build frozen, threads', True, args.threads)):
+            bulk = builder(size)
+            start = time.perf_counter()
+            if threads:
+                with ThreadPoolExecutor(threads) as executor:
+                    bulk.build(executor, freeze=freeze)
+            else:
+                bulk.build(freeze=freeze)
+            report(label, time.perf_counter() - start, bulk.timings)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Dispatching a request: `match_method` then the endpoint call, as the
+nodes did, against `Routes.dispatch`. Allocations are measured with
+tracemalloc, as the peak of the memory allocated while serving a
+request: the intermediate objects are freed once the request served.
+
+    python benchmarks/dispatch.py
+"""
+import timeit
+import tracemalloc
+from roughrider.routing.components import Routes
+
+
+def endpoint(request, **params):
+    return request
+
+
+def build(size: int) -> Routes:
+    router = Routes()
+    for i in range(size):
+        router.register(f'/section{i}/items')(endpoint)
+        router.register(f'/section{i}/items/{{id:digit}}')(endpoint)
+    return router
+
+
+def resolved(router, path, method, request):
+    # Dispatching as performed before `Routes.dispatch`.
+    route = router.match_method(path, method)
+    return route.endpoint(request, **route.params)
+
+
+def peak(func, calls: int = 1000) -> int:
+    func()  # Warm-up: lazily created objects are not per request.
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for _ in range(calls):
+            func()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def main(size: int = 300, number: int = 200000):
+    router = build(size)
+    request = object()
+    for label, path in (
+            ('static', f'/section{size // 2}/items'),
+            ('dynamic', f'/section{size // 2}/items/42')):
+        before = lambda: resolved(router, path, 'GET', request)
+        after = lambda: router.dispatch(path, 'GET', request)
+        assert before() is after() is request
+        times = [
+            min(timeit.repeat(func, number=number, repeat=5)) / number
+            for func in (before, after)
+        ]
+        print(f'{label:>8}: match_method + call {times[0] * 1e6:5.2f} us, '
+              f'{peak(before):4} B | dispatch {times[1] * 1e6:5.2f} us, '
+              f'{peak(after):4} B')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Lookups and memory of a frozen router against the autoroutes trie.
+
+    python benchmarks/frozen.py
+"""
+import timeit
+import tracemalloc
+from roughrider.routing.components import Routes
+
+
+def endpoint(request, **params):
+    pass
+
+
+def build(size: int) -> Routes:
+    router = Routes()
+    for i in range(size):
+        router.register(f'/section{i}/items')(endpoint)
+        router.register(f'/section{i}/items/{{id:digit}}')(endpoint)
+        router.register(f'/section{i}/items/{{id:digit}}/edit')(endpoint)
+        router.register(f'/section{i}/about/{{slug}}/comments')(endpoint)
+    return router
+
+
+def allocated(factory):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = factory()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def main(number: int = 50000):
+    for size in (10, 250, 2500):
+        router, trie_size = allocated(lambda: build(size))
+        frozen, frozen_size = allocated(router.freeze)
+        routes = size * 4
+        print(f'{routes} routes: trie {trie_size / routes:,.0f} B/route | '
+              f'frozen {frozen_size / routes:,.0f} B/route')
+        for path in (f'/section{size // 2}/items/42/edit',
+                     f'/section{size // 2}/about/intro/comments'):
+            trie = min(timeit.repeat(
+                lambda: router.match_method(path, 'GET'),
+                number=number, repeat=5))
+            flat = min(timeit.repeat(
+                lambda: frozen.match_method(path, 'GET'),
+                number=number, repeat=5))
+            print(f'  {path}: trie {number / trie:10,.0f} ops/s | '
+                  f'frozen {number / flat:10,.0f} ops/s | '
+                  f'x{trie / flat:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Introspection of APIView classes: the per-class methods cache against
+the former `inspect.getmembers` walk, over a few thousand views sharing
+base classes.
+
+    python benchmarks/get_routables.py
+"""
+import inspect
+import time
+from horseman.meta import APIView
+from roughrider.routing.utils import METHODS, VIEW_METHODS, get_routables
+
+
+def legacy_members(inst):
+    # Introspection as performed before the methods cache.
+    members = inspect.getmembers(
+        inst, predicate=(lambda x: inspect.ismethod(x)
+                         and x.__name__ in METHODS))
+    for name, func in members:
+        yield func, [name]
+
+
+class Base(APIView):
+
+    def GET(self, request):
+        pass
+
+    def helper(self):
+        pass
+
+
+class Editable(Base):
+
+    def POST(self, request):
+        pass
+
+    def PUT(self, request):
+        pass
+
+    def validate(self, data):
+        pass
+
+
+def views(count: int):
+    bases = (Base, Editable)
+    return [
+        type(f'View{i}', (bases[i % 2],), {
+            'DELETE': Base.GET,
+            **{f'attribute{j}': j for j in range(20)},
+        }) for i in range(count)
+    ]
+
+
+def timed(func, classes, registrations):
+    start = time.perf_counter()
+    for _ in range(registrations):
+        for cls in classes:
+            for _ in func(cls()):
+                pass
+    return time.perf_counter() - start
+
+
+def main(count: int = 3000, registrations: int = 3):
+    classes = views(count)
+    for cls in classes:
+        assert [verbs for _, verbs in get_routables(cls)] == \
+            [verbs for _, verbs in legacy_members(cls())]
+    VIEW_METHODS.clear()
+
+    # The first registration of a class fills the cache.
+    for label, times in (('first', 1), ('next', registrations)):
+        legacy = timed(legacy_members, classes, times)
+        cached = timed(get_routables, classes, times)
+        total = count * times
+        print(f'{label:>5} ({count} views x {times}): '
+              f'legacy {legacy / total * 1e6:6.1f} us/view | '
+              f'cached {cached / total * 1e6:6.1f} us/view | '
+              f'x{legacy / cached:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Lookups on a mixed static/dynamic route table, with and without
+the static routes index.
+
+    python benchmarks/static_routes.py
+"""
+import timeit
+from roughrider.routing.components import Routes, trie_match
+from roughrider.routing.meta import Route
+
+
+def endpoint(request, **params):
+    pass
+
+
+def build(size: int) -> Routes:
+    router = Routes()
+    for i in range(size):
+        router.register(f'/section{i}/items')(endpoint)
+        router.register(f'/section{i}/items/{{id:digit}}')(endpoint)
+        router.register(f'/section{i}/about/{{slug}}/comments')(endpoint)
+    return router
+
+
+def trie_only(router, path_info, method):
+    # Lookup as performed before the static index.
+    found, params = trie_match(router, path_info)
+    if found is None:
+        return None
+    return Route(path=path_info, params=params, endpoint=found.get(method))
+
+
+def main(size: int = 300, number: int = 100000):
+    router = build(size)
+    static = f'/section{size // 2}/items'
+    dynamic = f'/section{size // 2}/items/42'
+    for label, path in (('static', static), ('dynamic', dynamic)):
+        trie = min(timeit.repeat(
+            lambda: trie_only(router, path, 'GET'),
+            number=number, repeat=5))
+        indexed = min(timeit.repeat(
+            lambda: router.match_method(path, 'GET'),
+            number=number, repeat=5))
+        print(f'{label:>8}: trie {number / trie:12,.0f} ops/s | '
+              f'indexed {number / indexed:12,.0f} ops/s | '
+              f'x{trie / indexed:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Memory per route of the route tables of the suite, by settings.
+The memory is measured with tracemalloc, after the registration.
+
+    python benchmarks/storage.py
+    python benchmarks/storage.py --sizes 1000 20000
+"""
+import argparse
+import functools
+import gc
+import tracemalloc
+
+from roughrider.routing.components import NamedRoutes
+import tables
+
+
+SETTINGS = (
+    {},
+    {'compact': True},
+    {'auto_head': True, 'auto_options': True},
+    {'auto_head': True, 'auto_options': True, 'compact': True},
+)
+
+
+def memory(size: int, **settings) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        router = tables.build(
+            size, functools.partial(NamedRoutes, **settings))
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        del router
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000])
+    args = parser.parse_args()
+    for size in args.sizes:
+        print(f'## {size} routes')
+        for settings in SETTINGS:
+            label = ', '.join(
+                f'{key}={value}' for key, value in settings.items())
+            print(f'{label or "default":>45}: '
+                  f'{memory(size, **settings) / size:8,.0f} B/route')
+
+
+if __name__ == '__main__':
+    main()
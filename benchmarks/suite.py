@@ -0,0 +1,149 @@
+"""Routing benchmark suite.
+
+Generates route tables of 10, 1k and 10k routes mixing static,
+parameterized and typed placeholders, replays a request distribution
+and reports ops/sec, p50/p99 latencies and memory per route.
+
+    python benchmarks/suite.py
+    python benchmarks/suite.py --sizes 10 1000 --requests 50000
+    python benchmarks/suite.py --replay access.txt  # `METHOD /path` lines
+"""
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+import typing as t
+
+from horseman.http import HTTPError
+from roughrider.routing.components import NamedRoutes
+import tables
+
+
+class Result(t.NamedTuple):
+    name: str
+    ops: float
+    p50: float
+    p99: float
+
+
+def measure(name: str, func: t.Callable, calls: t.Sequence[tuple]) \
+        -> Result:
+    """Times each call, in nanoseconds. The timer overhead is measured
+    and deducted.
+    """
+    clock = time.perf_counter_ns
+    overhead = statistics.median(
+        -(clock() - clock()) for _ in range(1000))
+    timings = []
+    gc.disable()
+    try:
+        for args in calls:
+            start = clock()
+            try:
+                func(*args)
+            except HTTPError:
+                pass
+            timings.append(clock() - start)
+    finally:
+        gc.enable()
+    timings = [max(timing - overhead, 1) for timing in timings]
+    timings.sort()
+    return Result(
+        name=name,
+        ops=len(timings) / (sum(timings) / 1e9),
+        p50=timings[len(timings) // 2] / 1e3,
+        p99=timings[int(len(timings) * .99)] / 1e3,
+    )
+
+
+def build_timed(size: int) -> t.Tuple[NamedRoutes, float]:
+    start = time.perf_counter()
+    router = tables.build(size)
+    return router, time.perf_counter() - start
+
+
+def build_memory(size: int) -> int:
+    # Tracing slows the allocations down: the memory is measured on a
+    # build of its own.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        router = tables.build(size)
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        del router
+        tracemalloc.stop()
+
+
+def run(size: int, requests: t.Sequence[t.Tuple[str, str]]):
+    memory = build_memory(size)
+    router, elapsed = build_timed(size)
+    print(f'## {size} routes')
+    print(f'register: {elapsed * 1e3:10.1f} ms'
+          f' | {elapsed / size * 1e6:8.1f} us/route'
+          f' | {memory / size:8,.0f} B/route')
+
+    frozen = router.freeze()
+    calls = [(path, method) for method, path in requests]
+    results = [
+        measure('match_method', router.match_method, calls),
+        measure('match_method (frozen)', frozen.match_method, calls),
+    ]
+
+    values = {
+        'id': 12, 'cid': 3, 'name': 'john', 'tag': 'web', 'filepath': 'a/b',
+        'year': 2021, 'month': 10
+    }
+    urls = [
+        (name, {key: values[key] for key in builder.names})
+        for name, builder in router._urls.items()
+    ]
+
+    def url_for(name, params):
+        return router.url_for(name, **params)
+
+    results.append(measure(
+        'url_for', url_for, urls * max(1, len(calls) // len(urls))))
+
+    for result in results:
+        print(f'{result.name:>22}: {result.ops:12,.0f} ops/s'
+              f' | p50 {result.p50:7.2f} us | p99 {result.p99:7.2f} us')
+
+    start = time.perf_counter()
+    for _ in router.match_many(calls):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f'{"match_many":>22}: {len(calls) / elapsed:12,.0f} ops/s')
+
+    half = tables.templates(size)[size // 2:]
+    other = NamedRoutes()
+    for i, (path, methods, kind) in enumerate(half):
+        other.register(path, methods=methods, name=f'other{i}')(
+            tables.endpoint)
+    start = time.perf_counter()
+    router + other
+    elapsed = time.perf_counter() - start
+    print(f'{"__add__":>22}: {elapsed * 1e3:10.1f} ms '
+          f'({size} + {len(half)} routes)')
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10, 1000, 10000])
+    parser.add_argument('--requests', type=int, default=100000)
+    parser.add_argument('--replay', help='File of `METHOD /path` lines.')
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        if args.replay:
+            requests = tables.load(args.replay)
+        else:
+            requests = tables.requests(size, args.requests)
+        run(size, requests)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Realistic route tables and request distributions for the benchmarks.
+"""
+import random
+import typing as t
+from roughrider.routing.components import NamedRoutes
+
+
+HTTPRequest = t.Tuple[str, str]  # (method, path)
+
+# Shapes of the routes of a section: (path, methods, kind).
+SHAPES = (
+    ('/{section}', ['GET'], 'static'),
+    ('/{section}/about', ['GET'], 'static'),
+    ('/{section}/items', ['GET', 'POST'], 'static'),
+    ('/{section}/items/{{id}}', ['GET', 'PUT', 'DELETE'], 'param'),
+    ('/{section}/items/{{id}}/comments', ['GET', 'POST'], 'param'),
+    ('/{section}/posts/{{id:digit}}/comments/{{cid:digit}}', ['GET'],
+     'typed'),
+    ('/{section}/users/{{name:alpha}}', ['GET'], 'typed'),
+    ('/{section}/tags/{{tag:alnum}}/', ['GET'], 'typed'),
+    ('/{section}/files/{{filepath:path}}', ['GET'], 'typed'),
+    ('/{section}/archive/{{year:digit}}-{{month:digit}}', ['GET'], 'typed'),
+)
+
+VALUES = {
+    'id': lambda rng: str(rng.randint(1, 100000)),
+    'cid': lambda rng: str(rng.randint(1, 1000)),
+    'name': lambda rng: rng.choice(('john', 'jane', 'alice', 'bob')),
+    'tag': lambda rng: rng.choice(('python', 'web2', 'wsgi')),
+    'filepath': lambda rng: rng.choice(('css/main.css', 'js/app.js')),
+    'year': lambda rng: str(rng.randint(2000, 2030)),
+    'month': lambda rng: f'{rng.randint(1, 12):02d}',
+}
+
+
+def endpoint(request, **params):
+    pass
+
+
+def templates(size: int) -> t.List[t.Tuple[str, t.List[str], str]]:
+    """Returns `size` route templates, by section of SHAPES.
+    """
+    routes = []
+    section = 0
+    while len(routes) < size:
+        for path, methods, kind in SHAPES:
+            routes.append(
+                (path.format(section=f'section{section}'), methods, kind))
+        section += 1
+    return routes[:size]
+
+
+def build(size: int, factory=NamedRoutes) -> NamedRoutes:
+    router = factory()
+    for i, (path, methods, kind) in enumerate(templates(size)):
+        router.register(path, methods=methods, name=f'route{i}')(endpoint)
+    return router
+
+
+def fill(path: str, rng: random.Random) -> str:
+    for name, value in VALUES.items():
+        for placeholder in (
+                f'{{{name}}}', f'{{{name}:digit}}', f'{{{name}:alpha}}',
+                f'{{{name}:alnum}}', f'{{{name}:path}}'):
+            if placeholder in path:
+                path = path.replace(placeholder, value(rng))
+    return path
+
+
+def requests(size: int, count: int, seed: int = 42,
+             not_found: float = .05, not_allowed: float = .02,
+             skew: float = 1.1) -> t.List[HTTPRequest]:
+    """Generates `count` requests, following a Zipf-like distribution
+    over the routes: a few routes get most of the traffic.
+    """
+    rng = random.Random(seed)
+    routes = templates(size)
+    weights = [1 / (rank ** skew) for rank in range(1, len(routes) + 1)]
+    rng.shuffle(weights)
+    generated = []
+    for path, methods, kind in rng.choices(routes, weights, k=count):
+        draw = rng.random()
+        if draw < not_found:
+            generated.append(('GET', f'/missing{rng.randint(1, 100)}'))
+        elif draw < not_found + not_allowed:
+            generated.append(('PATCH', fill(path, rng)))
+        else:
+            generated.append((rng.choice(methods), fill(path, rng)))
+    return generated
+
+
+def load(filename: str) -> t.List[HTTPRequest]:
+    """Loads recorded requests: one `METHOD /path` per line, such as
+    extracted from an access log.
+    """
+    recorded = []
+    with open(filename) as lines:
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                method, path = line.split(None, 1)
+                recorded.append((method.upper(), path))
+    return recorded
@@ -0,0 +1,52 @@
+"""Reverse routing: compiled URL builders against `str.format` over the
+registered path, as `NamedRoutes.url_for` used to do.
+
+    python benchmarks/url_for.py
+"""
+import timeit
+from roughrider.routing.components import NamedRoutes
+
+
+def endpoint(request, **params):
+    pass
+
+
+def legacy_url_for(router, name, **params):
+    path = router._names.get(name)
+    if path is None:
+        raise LookupError(f'Unknown route `{name}`.')
+    try:
+        return path.format(**params)
+    except KeyError:
+        raise ValueError(
+            f"No route found with name {name} and params {params}.")
+
+
+def main(number: int = 200000):
+    router = NamedRoutes()
+    router.register('/about', name='about')(endpoint)
+    router.register('/item/{id}', name='item')(endpoint)
+    router.register(
+        '/user/{user}/item/{id}/comments/{cid}', name='comment')(endpoint)
+
+    cases = (
+        ('static', 'about', {}),
+        ('1 param', 'item', {'id': 42}),
+        ('3 params', 'comment', {'user': 'john', 'id': 42, 'cid': 7}),
+    )
+    for label, name, params in cases:
+        assert router.url_for(name, **params) == legacy_url_for(
+            router, name, **params)
+        legacy = min(timeit.repeat(
+            lambda: legacy_url_for(router, name, **params),
+            number=number, repeat=5))
+        compiled = min(timeit.repeat(
+            lambda: router.url_for(name, **params),
+            number=number, repeat=5))
+        print(f'{label:>8}: format {number / legacy:12,.0f} ops/s | '
+              f'compiled {number / compiled:12,.0f} ops/s | '
+              f'x{legacy / compiled:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Bulk reverse routing: `NamedRoutes.url_for_many` against
+`NamedRoutes.url_for` called in a loop.
+
+    python benchmarks/url_for_many.py
+"""
+import timeit
+from roughrider.routing.components import NamedRoutes
+
+
+def endpoint(request, **params):
+    pass
+
+
+def main(rows: int = 500, number: int = 500):
+    router = NamedRoutes()
+    router.register('/shop/{shop}/item/{id:digit}', name='item')(endpoint)
+
+    params = [{'shop': 'main', 'id': i} for i in range(rows)]
+    ids = list(range(rows))
+    shops = ['main'] * rows
+    url_for = router.url_for
+
+    loop = min(timeit.repeat(
+        lambda: [url_for('item', **row) for row in params],
+        number=number, repeat=5))
+    many = min(timeit.repeat(
+        lambda: router.url_for_many('item', params),
+        number=number, repeat=5))
+    columns = min(timeit.repeat(
+        lambda: router.url_for_many('item', shop=shops, id=ids),
+        number=number, repeat=5))
+
+    urls = number * rows
+    print(f'{rows} urls per call')
+    print(f'url_for loop:          {urls / loop:12,.0f} urls/s')
+    print(f'url_for_many mappings: {urls / many:12,.0f} urls/s '
+          f'| x{loop / many:.2f}')
+    print(f'url_for_many columns:  {urls / columns:12,.0f} urls/s '
+          f'| x{loop / columns:.2f}')
+
+
+if __name__ == '__main__':
+    main()
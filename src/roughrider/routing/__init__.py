@@ -1,2 +1,3 @@
 from roughrider.routing.meta import Route
-from roughrider.routing.components import Routes, NamedRoutes
+from roughrider.routing.components import (
+    Routes, NamedRoutes, MethodNotAllowed)
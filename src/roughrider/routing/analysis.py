@@ -0,0 +1,235 @@
+"""Analysis of the route tables.
+
+    for issue in analyze(routes):
+        print(issue.kind, issue.path, issue.detail)
+
+Reports:
+
+- `lost` routes, dropped by the trie on insertion, and `duplicate`
+  methods, registered again on a path with another endpoint: the last
+  endpoint wins;
+- `ambiguous` routes, matching some paths of another route, such as
+  `/item/{id}` and `/item/new`, or `/item/{id}` and `/item/{name}`;
+- `shadowed` routes, a sample path of which is served by another route;
+- `deep` routes and `wide` trie nodes, slowing the lookups down.
+
+The overlaps are looked up in an index of the routes segments: each
+route only visits the branches it may overlap with.
+"""
+import re
+import typing as t
+
+from roughrider.routing.components import Routes
+from roughrider.routing.frozen import CHECKS, compile_parts, is_tail, split
+from roughrider.routing.urls import Placeholder, parse
+
+
+LOST = 'lost'
+DUPLICATE = 'duplicate'
+AMBIGUOUS = 'ambiguous'
+SHADOWED = 'shadowed'
+DEEP = 'deep'
+WIDE = 'wide'
+
+# Sample values of the placeholders, by match type. The values of the
+# regular expressions placeholders are picked among the candidates.
+SAMPLES = {
+    'string': 'sample',
+    'alpha': 'sample',
+    'alnum': 'sample0',
+    'digit': '0',
+    'path': 'sample/path',
+    'any': 'sample',
+}
+CANDIDATES = ('0', 'sample', 'sample0', 'sample-0', 'sample/0')
+
+# Match types of the placeholders that never match a same value.
+DISJOINT = {frozenset(('digit', 'alpha'))}
+
+
+class Issue(t.NamedTuple):
+    kind: str
+    path: str
+    detail: str
+    other: t.Optional[str] = None
+
+
+class Segment:
+    """Node of the index of the routes segments.
+    """
+    __slots__ = ('literals', 'patterns', 'routes', 'tails')
+
+    def __init__(self):
+        self.literals = {}
+        self.patterns = {}  # pattern node by parts
+        self.routes = []
+        self.tails = []
+
+    def subtree(self) -> t.Iterator[int]:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield from node.routes
+            yield from node.tails
+            stack.extend(node.literals.values())
+            stack.extend(node.patterns.values())
+
+
+def literal(segment: list) -> t.Optional[str]:
+    if all(part.__class__ is str for part in segment):
+        return ''.join(segment)
+    return None
+
+
+def matches(segment: tuple, value: str) -> bool:
+    # Whether the pattern segment matches the literal segment.
+    if len(segment) == 1:
+        return CHECKS[segment[0].match_type](value)
+    return compile_parts(segment)[0](value) is not None
+
+
+def overlap(first: tuple, second: tuple) -> bool:
+    # Whether the pattern segments may match a same value. Patterns of
+    # several parts are assumed to.
+    if len(first) == 1 and len(second) == 1:
+        types = frozenset((first[0].match_type, second[0].match_type))
+        return types not in DISJOINT
+    return True
+
+
+def sample(path: str) -> t.Optional[str]:
+    parts = []
+    for part in parse(path):
+        if part.__class__ is not Placeholder:
+            parts.append(part)
+        elif part.match_type in SAMPLES:
+            parts.append(SAMPLES[part.match_type])
+        else:
+            found = re.compile(part.match_type).fullmatch
+            for candidate in CANDIDATES:
+                if found(candidate):
+                    parts.append(candidate)
+                    break
+            else:
+                return None
+    return ''.join(parts)
+
+
+def index(paths: t.Sequence[str]) \
+        -> t.Tuple[Segment, t.List[t.List[list]]]:
+    root = Segment()
+    segmented = []
+    for position, path in enumerate(paths):
+        segments = split(path)
+        segmented.append(segments)
+        node = root
+        for segment in segments:
+            if is_tail(segment):
+                node.tails.append(position)
+                break
+            text = literal(segment)
+            if text is not None:
+                node = node.literals.setdefault(text, Segment())
+            else:
+                node = node.patterns.setdefault(tuple(segment), Segment())
+        else:
+            node.routes.append(position)
+    return root, segmented
+
+
+def overlapping(root: Segment, segments: t.List[list]) -> t.Set[int]:
+    """Returns the positions of the routes that may match a path of
+    the given segments.
+    """
+    found = set()
+    stack = [(root, 0)]
+    while stack:
+        node, position = stack.pop()
+        if position == len(segments):
+            found.update(node.routes)
+            continue
+        # The tails match any remaining segments.
+        found.update(node.tails)
+        segment = segments[position]
+        if is_tail(segment):
+            found.update(node.subtree())
+            continue
+        text = literal(segment)
+        if text is not None:
+            child = node.literals.get(text)
+            if child is not None:
+                stack.append((child, position + 1))
+            for parts, child in node.patterns.items():
+                if matches(parts, text):
+                    stack.append((child, position + 1))
+        else:
+            parts = tuple(segment)
+            for value, child in node.literals.items():
+                if matches(parts, value):
+                    stack.append((child, position + 1))
+            for other, child in node.patterns.items():
+                if overlap(parts, other):
+                    stack.append((child, position + 1))
+    return found
+
+
+def structure(routes: Routes, max_depth: int, max_width: int) \
+        -> t.Iterator[Issue]:
+    stack = [(routes.root, '', 0)]
+    while stack:
+        node, prefix, depth = stack.pop()
+        edges = node.edges or ()
+        if len(edges) > max_width:
+            yield Issue(WIDE, prefix, f'{len(edges)} edges')
+        if node.path and depth > max_depth:
+            yield Issue(DEEP, node.path, f'{depth} edges deep')
+        for edge in edges:
+            stack.append((edge.child, prefix + edge.pattern, depth + 1))
+
+
+def conflicts(routes: Routes, prefix: str = '') -> t.Iterator[Issue]:
+    for kind, path, methods in routes._conflicts:
+        if kind == LOST:
+            detail = 'dropped by the trie'
+        else:
+            detail = f"{', '.join(methods)} registered again"
+        yield Issue(kind, prefix + path, detail)
+    for mount in routes._mounts:
+        yield from conflicts(mount.router, prefix + mount.prefix)
+
+
+def analyze(routes: Routes, max_depth: int = 24,
+            max_width: int = 64) -> t.List[Issue]:
+    """Returns the issues of the route table, mounted routes included.
+    """
+    issues = list(conflicts(routes))
+    definitions = list(routes)
+    paths = [routedef.path for routedef in definitions]
+    root, segmented = index(paths)
+    for position, path in enumerate(paths):
+        for other in sorted(overlapping(root, segmented[position])):
+            if other < position:
+                issues.append(Issue(
+                    AMBIGUOUS, path, f'overlaps {paths[other]}',
+                    paths[other]))
+
+    served = {
+        id(routedef.payload): routedef.path for routedef in definitions}
+    for routedef in definitions:
+        value = sample(routedef.path)
+        if value is None:
+            continue
+        found, _ = routes.match(value)
+        if found is routedef.payload or found is not None and all(
+                found.get(method) is endpoint
+                for method, endpoint in routedef.payload.items()):
+            continue
+        other = served.get(id(found)) if found is not None else None
+        issues.append(Issue(
+            SHADOWED, routedef.path,
+            f'{value} is served by {other}' if found is not None
+            else f'{value} is not served', other))
+
+    if routes._table is None:
+        issues.extend(structure(routes, max_depth, max_width))
+    return issues
@@ -0,0 +1,124 @@
+"""Minimal ASGI adapter of the routes.
+
+The node routes with the very same routes as the WSGI nodes: one route
+table can serve both. Coroutine endpoints are awaited, the synchronous
+ones are run in an executor, not to block the event loop.
+"""
+import asyncio
+import functools
+import typing as t
+
+from horseman.http import HTTPError
+from horseman.meta import slashes_normalization
+from horseman.response import Response
+from roughrider.routing.components import Routes
+from roughrider.routing.meta import Route
+
+
+Scope = t.Dict[str, t.Any]
+Receive = t.Callable[[], t.Awaitable[dict]]
+Send = t.Callable[[dict], t.Awaitable[None]]
+
+
+class Request:
+    """Request handed over to the endpoints, as the overhead of the
+    WSGI nodes.
+    """
+    __slots__ = ('node', 'scope', 'receive', 'route')
+
+    def __init__(self, node: 'ASGINode', scope: Scope, receive: Receive,
+                 route: Route):
+        self.node = node
+        self.scope = scope
+        self.receive = receive
+        self.route = route
+
+    async def body(self) -> bytes:
+        chunks = []
+        while True:
+            message = await self.receive()
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+
+class ASGINode:
+
+    request_factory = Request
+
+    def __init__(self, routes: Routes, threaded: bool = True,
+                 executor=None):
+        self.routes = routes
+        # Synchronous endpoints run in the executor of the loop, unless
+        # not threaded.
+        self.threaded = threaded
+        self.executor = executor
+
+    async def call(self, route: Route, request) -> t.Any:
+        endpoint = route.endpoint
+        if endpoint.is_async:
+            return await endpoint(request, **route.params)
+        if self.threaded:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                functools.partial(endpoint, request, **route.params))
+        else:
+            result = endpoint(request, **route.params)
+        if hasattr(result, '__await__'):
+            # Endpoints not known as coroutines, such as the lazy ones.
+            result = await result
+        return result
+
+    async def resolve(self, path: str, scope: Scope, receive: Receive) \
+            -> t.Optional[Response]:
+        route = self.routes.match_method(path, scope['method'])
+        if route is not None:
+            request = self.request_factory(self, scope, receive, route)
+            return await self.call(route, request)
+
+    async def respond(self, response: Response, send: Send):
+        await send({
+            'type': 'http.response.start',
+            'status': response.status.value,
+            'headers': [
+                (key.lower().encode('latin-1'), value.encode('latin-1'))
+                for key, value in response.headers.items()
+            ],
+        })
+        try:
+            for chunk in response:
+                await send({
+                    'type': 'http.response.body',
+                    'body': chunk,
+                    'more_body': True,
+                })
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            response.close()
+
+    async def lifespan(self, receive: Receive, send: Send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported scope type: {scope['type']!r}.")
+
+        path = scope['path']
+        if path:
+            path = slashes_normalization.sub('/', path)
+        try:
+            response = await self.resolve(path, scope, receive)
+            if response is None:
+                response = Response(404)
+        except HTTPError as error:
+            response = Response(
+                error.status, error.body, getattr(error, 'headers', None))
+        await self.respond(response, send)
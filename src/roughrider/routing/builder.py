@@ -0,0 +1,214 @@
+"""Bulk construction of the route tables.
+
+The registrations are collected first, then built in phases: the
+introspection of the views, possibly in an executor, the endpoints
+creation, the validation of the names, a single ordered insertion and
+the compilation of the URL builders. Each phase is timed.
+
+    builder = RoutesBuilder(NamedRoutes())
+
+    @builder.register('/users/{id}', name='user')
+    def user(request, id):
+        ...
+
+    routes = builder.build()
+    print(builder.timings)
+
+Building frozen routes skips the trie: its insertions recompile it
+whole, the flat table is compiled in a single pass.
+"""
+import sys
+import time
+import typing as t
+from itertools import repeat
+
+from roughrider.routing import utils
+from roughrider.routing.components import Routes, NamedRoutes
+from roughrider.routing.converters import route_converter
+from roughrider.routing.frozen import FlatTable
+from roughrider.routing.lazy import LazyView
+from roughrider.routing.meta import Endpoint, HTTPMethods, RouteDefinition
+
+
+class Registration(t.NamedTuple):
+    path: str
+    view: t.Any
+    methods: t.Optional[HTTPMethods] = None
+    converters: t.Optional[t.Mapping[str, t.Any]] = None
+    metadata: t.Optional[dict] = None
+
+
+class Timings(t.NamedTuple):
+    introspection: float
+    endpoints: float
+    validation: float
+    insertion: float
+    urls: float
+
+    @property
+    def total(self) -> float:
+        return sum(self)
+
+
+def introspect(extractor, view, methods: t.Optional[HTTPMethods]) \
+        -> t.List[t.Tuple[Endpoint, t.List[str]]]:
+    # Runs in the executor: the result may cross processes.
+    return [
+        (endpoint, list(verbs)) for endpoint, verbs in extractor(view, methods)
+    ]
+
+
+def update(definitions: t.Dict[str, dict], path: str, payload: dict,
+           conflicts: t.List[t.Tuple]):
+    # The overwritten endpoints are recorded as by `Routes._insert`.
+    definition = definitions.setdefault(path, {})
+    overwritten = tuple(
+        method for method in payload
+        if method in definition and definition[method] != payload[method])
+    if overwritten:
+        conflicts.append(('duplicate', path, overwritten))
+    definition.update(payload)
+
+
+class RoutesBuilder:
+
+    __slots__ = ('routes', 'registrations', 'timings')
+
+    def __init__(self, routes: Routes):
+        if routes._table is not None:
+            raise TypeError("Frozen routes can't be modified.")
+        self.routes = routes
+        self.registrations = []
+        self.timings = None
+
+    def register(self, path: str, methods: HTTPMethods = None,
+                 converters: t.Optional[t.Mapping[str, t.Any]] = None,
+                 **metadata):
+        def registration(view):
+            self.registrations.append(
+                Registration(path, view, methods, converters, metadata))
+            return view
+        return registration
+
+    def extend(self, registrations: t.Iterable[Registration]):
+        self.registrations.extend(
+            Registration(*registration) for registration in registrations)
+
+    def build(self, executor=None, freeze: bool = False) -> Routes:
+        """Adds the registered routes to the routes, in the registration
+        order, and returns them. The views are introspected in the
+        executor, if any. Frozen routes are returned if `freeze` is
+        true, the routes being left untouched.
+        Nothing is added if a registration is invalid.
+        """
+        routes = self.routes
+        registrations = self.registrations
+        named = isinstance(routes, NamedRoutes)
+        clock = time.perf_counter
+
+        start = clock()
+        if routes.lazy:
+            routables = repeat(None)
+        elif executor is None:
+            routables = [
+                introspect(routes.extractor, registration.view,
+                           registration.methods)
+                for registration in registrations
+            ]
+        else:
+            routables = list(executor.map(
+                introspect, repeat(routes.extractor),
+                [registration.view for registration in registrations],
+                [registration.methods for registration in registrations]))
+
+        introspected = clock()
+        definitions = {}
+        converters = {}
+        lazy_views = {}
+        # Endpoints overwritten by a later registration of the path.
+        conflicts = []
+        for registration, routed in zip(registrations, routables):
+            path, converter = route_converter(
+                registration.path, registration.converters)
+            path = sys.intern(path)
+            if converter is not None:
+                converters[path] = converter
+            metadata = registration.metadata or None
+            if routes.compact and metadata:
+                metadata = routes._shared(metadata)
+            if routed is None:
+                lazy = LazyView(
+                    registration.view, registration.methods,
+                    routes.extractor, metadata)
+                lazy_views.setdefault(path, []).append(lazy)
+                payload = lazy.payload(utils.extracted_methods(
+                    routes.extractor, registration.view,
+                    registration.methods))
+            else:
+                payload = {
+                    method: utils.route_endpoint(method, endpoint, metadata)
+                    for endpoint, verbs in routed for method in verbs
+                }
+            update(definitions, path, payload, conflicts)
+
+        created = clock()
+        names = {}
+        if named:
+            known = routes._names
+            for path, payload in definitions.items():
+                for endpoint in payload.values():
+                    if not endpoint.metadata \
+                            or 'name' not in endpoint.metadata:
+                        continue
+                    name = endpoint.metadata['name']
+                    found = known.get(name) or names.get(name)
+                    if found is None:
+                        names[name] = path
+                    elif found != path:
+                        raise NameError(
+                            f"Route {name!r} already exists "
+                            f"for path {found!r}.")
+
+        validated = clock()
+        if freeze:
+            merged = {
+                routedef.path: dict(routedef.payload) for routedef in routes}
+            for path, payload in definitions.items():
+                update(merged, path, payload, conflicts)
+            built = routes._frozen(
+                FlatTable(
+                    RouteDefinition(path, payload)
+                    for path, payload in merged.items()),
+                {**dict(routes._flat_converters()), **converters})
+            if named:
+                built._names = {**dict(routes._flat_names()), **names}
+            built._conflicts.extend(conflicts)
+        else:
+            built = routes
+            built._conflicts.extend(conflicts)
+            built._converters.update(converters)
+            for path, payload in definitions.items():
+                node_payload = built._insert(path, payload)
+                if node_payload is not None:
+                    for lazy in lazy_views.get(path, ()):
+                        lazy.payloads.append(node_payload)
+            built._invalidate()
+            if named:
+                built._names.update(names)
+
+        inserted = clock()
+        if named and not built.compact:
+            urls = routes._urls
+            built._urls = {
+                name: urls.get(name) or built._builder(path)
+                for name, path in built._names.items()
+            }
+
+        self.timings = Timings(
+            introspection=introspected - start,
+            endpoints=created - introspected,
+            validation=validated - created,
+            insertion=inserted - validated,
+            urls=clock() - inserted,
+        )
+        return built
@@ -0,0 +1,108 @@
+"""Guards and middlewares of the routes, declared in the metadata.
+
+    @router.register('/admin', guards=[authenticated],
+                     middlewares=[cached])
+    def admin(request):
+        ...
+
+A guard is called with the request and the params before the endpoint
+and rejects the request by raising an HTTPError. A middleware wraps the
+endpoint: `middleware(endpoint) -> endpoint`, the first middleware
+being the outermost. The guards run before the middlewares.
+
+The `cache` metadata caches the responses of the route, see
+`roughrider.routing.responses`: the lookup runs after the guards.
+
+The chain is composed once, at registration, into a single function per
+method: the guards and the cache lookup are inline, nothing is resolved
+per request.
+"""
+import inspect
+import typing as t
+
+from roughrider.routing import responses
+from roughrider.routing.meta import Endpoint
+from roughrider.routing.urls import compile_source
+
+
+GUARDS = 'guards'
+MIDDLEWARES = 'middlewares'
+CACHE = 'cache'
+CHAINS = (GUARDS, MIDDLEWARES)
+
+
+def cached(metadata: t.Optional[t.Mapping], method: str) -> bool:
+    return bool(metadata) and metadata.get(CACHE) is not None \
+        and method in responses.CACHEABLE
+
+
+def chained(metadata: t.Optional[t.Mapping], method: str) -> bool:
+    return bool(metadata) and (
+        bool(metadata.get(GUARDS)) or bool(metadata.get(MIDDLEWARES))
+        or cached(metadata, method))
+
+
+def compose(endpoint: Endpoint, metadata: t.Optional[t.Mapping],
+            method: str, is_async: bool = False) -> Endpoint:
+    """Returns the endpoint wrapped in the chain declared in the
+    metadata, or the endpoint itself if there's none. The original
+    endpoint is kept as `__wrapped__` of the composed function.
+    """
+    if not chained(metadata, method):
+        return endpoint
+    handler = endpoint
+    for middleware in reversed(metadata.get(MIDDLEWARES) or ()):
+        handler = middleware(handler)
+
+    namespace = {'handler': handler}
+    lines = []
+    for i, guard in enumerate(metadata.get(GUARDS) or ()):
+        if not callable(guard):
+            raise TypeError(f'Invalid guard: {guard!r}.')
+        namespace[f'g{i}'] = guard
+        if inspect.iscoroutinefunction(guard):
+            if not is_async:
+                raise TypeError(
+                    f'Coroutine guard {guard!r} of a synchronous '
+                    f'endpoint: {endpoint!r}.')
+            lines.append(f'    await g{i}(request, **params)')
+        else:
+            lines.append(f'    g{i}(request, **params)')
+    call = 'await handler' if is_async else 'handler'
+    if cached(metadata, method):
+        ttl = metadata[CACHE]
+        if isinstance(ttl, bool) or not isinstance(ttl, (int, float)) \
+                or ttl <= 0:
+            raise ValueError(f'Invalid cache duration: {ttl!r}.')
+        route = responses.identity(endpoint, metadata, method)
+        namespace.update(responses=responses.RESPONSES, ttl=ttl, route=route)
+        lines.extend((
+            '    key = (route, tuple(params.items()))',
+            '    response = responses.get(key)',
+            '    if response is None:',
+            f'        response = {call}(request, **params)',
+            '        if response is not None:',
+            '            responses.store(key, response, ttl)',
+            '    return response',
+        ))
+    else:
+        lines.append(f'    return {call}(request, **params)')
+    header = 'def chain(request, **params):'
+    if is_async:
+        header = f'async {header}'
+    exec(compile_source('\n'.join((header, *lines))), namespace)
+    chain = namespace['chain']
+    chain.__wrapped__ = endpoint
+    if cached(metadata, method):
+        # The identity of the route in the responses cache.
+        chain.route = route
+    return chain
+
+
+def original(endpoint: Endpoint, metadata: t.Optional[t.Mapping],
+             method: str) -> Endpoint:
+    """Returns the endpoint as registered, before its composition.
+    """
+    if chained(metadata, method):
+        return endpoint.__wrapped__
+    return endpoint
@@ -1,103 +1,808 @@
+import functools
+import sys
+import threading
 import typing as t
+from itertools import repeat
 from http import HTTPStatus
 
 import autoroutes
 from horseman.types import HTTPMethod
 from horseman.meta import APIView
 from horseman.http import HTTPError
+from horseman.response import Response
 from roughrider.routing import utils
+from roughrider.routing.responses import RESPONSES
+from roughrider.routing.frozen import FlatTable
+from roughrider.routing.instruments import Instrumentation, BUCKETS
+from roughrider.routing.lazy import LazyView
+from roughrider.routing.converters import RouteConverter, route_converter
+from roughrider.routing.urls import URLBuilder, PLACEHOLDER
 from roughrider.routing.meta import (
     HTTPMethods, Route, RouteEndpoint, RouteDefinition
 )
 
 
+trie_match = autoroutes.Routes.match
+
+# Outcomes of the batch matching. Enum members access is not free.
+NOT_FOUND = HTTPStatus.NOT_FOUND
+METHOD_NOT_ALLOWED = HTTPStatus.METHOD_NOT_ALLOWED
+
+
+@functools.lru_cache(maxsize=1024)
+def canonical(pattern: str) -> str:
+    """Replaces the placeholders by their match type: `{id:digit}`
+    becomes `{digit}`.
+    """
+    return PLACEHOLDER.sub(
+        lambda found: f'{{{found.group(2) or autoroutes.DEFAULT_MATCH_TYPE}}}',
+        pattern
+    )
+
+
+class MethodNotAllowed(HTTPError):
+
+    def __init__(self, allow: str):
+        super().__init__(HTTPStatus.METHOD_NOT_ALLOWED)
+        self.allow = allow
+        self.headers = {'Allow': allow}
+
+    def response(self) -> Response:
+        # horseman's Node renders the HTTP errors without their headers.
+        return Response(self.status, self.body, self.headers)
+
+
+class Allowance(t.NamedTuple):
+    header: str
+    options: t.Optional[RouteEndpoint] = None
+    mask: int = 0
+
+
+# Payloads methods as a bitmask: the allowances are shared by the
+# payloads having the same methods. The methods horseman doesn't know,
+# such as the WebDAV ones, get their bit on their first registration.
+METHOD_BITS = {
+    method: 1 << bit for bit, method in enumerate(sorted(utils.METHODS))}
+METHOD_BITS_LOCK = threading.Lock()
+
+
+def method_bit(method: str) -> int:
+    bit = METHOD_BITS.get(method)
+    if bit is None:
+        with METHOD_BITS_LOCK:
+            bit = METHOD_BITS.setdefault(method, 1 << len(METHOD_BITS))
+    return bit
+
+
+@functools.lru_cache(maxsize=None)
+def allowance(mask: int, auto_head: bool, auto_options: bool) -> Allowance:
+    with METHOD_BITS_LOCK:
+        methods = {
+            method for method, bit in METHOD_BITS.items() if mask & bit}
+    if auto_head and 'GET' in methods:
+        methods.add('HEAD')
+    if auto_options:
+        methods.add('OPTIONS')
+    header = ', '.join(sorted(methods))
+    if auto_options:
+        return Allowance(header, options_endpoint(header), mask)
+    return Allowance(header, None, mask)
+
+
+def options_endpoint(allow: str) -> RouteEndpoint:
+    # The endpoint is shared by the routers: each request gets its own
+    # response, that can be changed without affecting the others.
+
+    def options(request, **params):
+        return Response(204, headers={'Allow': allow})
+
+    return RouteEndpoint(method='OPTIONS', endpoint=options)
+
+
+class Mount(t.NamedTuple):
+    prefix: str
+    router: 'Routes'
+    namespace: t.Optional[str] = None
+
+
 class Routes(autoroutes.Routes):
 
-    __slots__ = ('extractor')
+    __slots__ = (
+        'extractor', 'auto_head', 'auto_options', 'lazy', 'compact',
+        '_static', '_dynamic', '_table', '_allowed', '_cache', '_resolve',
+        '_mounts', '_parents', '_converters', '_convert', '_metadata',
+        '_conflicts', 'instruments')
 
-    def __init__(self, extractor=utils.get_routables):
+    def __init__(self, extractor=utils.get_routables,
+                 cache_size: t.Optional[int] = None,
+                 auto_head: bool = False,
+                 auto_options: bool = False,
+                 lazy: bool = False,
+                 compact: bool = False):
         self.extractor = extractor
+        # Views are introspected and instantiated on their first call:
+        # the extractor reports the methods beforehand.
+        if lazy and getattr(extractor, 'methods', None) is None:
+            raise TypeError(
+                f"Lazy routes need an extractor reporting its methods, "
+                f"as `methods(view, methods)`: {extractor!r}.")
+        self.lazy = lazy
+        # Equal metadata are shared and the URL builders compiled on
+        # their first use.
+        self.compact = compact
+        self._metadata = {}
+        # HEAD requests served by the GET endpoints, OPTIONS requests
+        # answered by the router.
+        self.auto_head = auto_head
+        self.auto_options = auto_options
+        # Allowed methods of each payload, by payload id.
+        self._allowed = {}
+        # Literal paths are indexed by exact match, bypassing the trie.
+        # The payloads are the very dicts held by the trie nodes.
+        self._static = {}
+        self._dynamic = super().match
+        self._table = None
+        if cache_size:
+            # Results, including the 404 and 405 outcomes, are memoized
+            # on the `(path_info, method)` couple.
+            self._cache = functools.lru_cache(maxsize=cache_size)(
+                self._lookup)
+            self._resolve = self._cached
+        else:
+            self._cache = None
+            self._resolve = self._lookup
+        self.instruments = None
+        # Mounted routers, longest prefixes first, and the routers this
+        # one is mounted in.
+        self._mounts = ()
+        self._parents = []
+        # Params converters by route path, and their conversion function
+        # by payload id.
+        self._converters = {}
+        self._convert = {}
+        # Insertions that lost a route or overwrote endpoints, as
+        # `(kind, path, methods)`.
+        self._conflicts = []
 
-    def add(self, path: str, payload: t.Dict[HTTPMethod, RouteEndpoint]):
+    @property
+    def settings(self) -> t.Dict[str, t.Any]:
+        info = self.cache_info()
+        return {
+            'extractor': self.extractor,
+            'cache_size': info.maxsize if info is not None else None,
+            'auto_head': self.auto_head,
+            'auto_options': self.auto_options,
+            'lazy': self.lazy,
+            'compact': self.compact,
+        }
+
+    def cache_info(self):
+        if self._cache is None:
+            return None
+        return self._cache.cache_info()
+
+    def _node(self, path: str) -> t.Optional[autoroutes.Node]:
+        # autoroutes merges placeholders of the same type whatever their
+        # name and splits the edges: the walk compares canonical forms,
+        # backtracking on the edges sharing a prefix.
+        target = canonical(path)
+        length = len(target)
+        pending = [(self.root, 0)]
+        while pending:
+            node, pos = pending.pop()
+            if pos == length:
+                if node.path is not None and canonical(node.path) == target:
+                    return node
+                continue
+            for edge in reversed(node.edges or ()):
+                pattern = edge.pattern
+                if '{' in pattern:
+                    pattern = canonical(pattern)
+                if target.startswith(pattern, pos):
+                    pending.append((edge.child, pos + len(pattern)))
+        return None
+
+    def _insert(self, path: str,
+                payload: t.Dict[HTTPMethod, RouteEndpoint]) \
+            -> t.Optional[t.Dict[HTTPMethod, RouteEndpoint]]:
+        # Returns the payload of the node, holding the given endpoints.
+        if self._table is not None:
+            raise TypeError("Frozen routes can't be modified.")
+        # The node payload is updated in place: the endpoints it holds
+        # are looked up beforehand.
+        node = self._node(path)
+        previous = node.payload if node is not None else None
+        # Computed before the trie changes, which it can't fail.
+        allowed = self._allowance({**previous, **payload} if previous
+                                  else payload)
+        if previous:
+            overwritten = tuple(
+                method for method in payload
+                if method in previous and previous[method] != payload[method])
+            if overwritten:
+                self._conflicts.append(('duplicate', path, overwritten))
         super().add(path, **payload)
+        node = self._node(path)
+        if node is None:
+            # autoroutes can lose a route: such as a regex placeholder
+            # added after a longer path sharing the same placeholder.
+            self._conflicts.append(('lost', path, tuple(payload)))
+            return None
+        self._allowed[id(node.payload)] = allowed
+        if '{' not in path:
+            self._static[path] = node.payload
+        else:
+            converter = self._converters.get(path)
+            if converter is not None:
+                self._convert[id(node.payload)] = converter.convert
+        return node.payload
+
+    def add(self, path: str, payload: t.Dict[HTTPMethod, RouteEndpoint]):
+        node_payload = self._insert(path, payload)
+        self._invalidate()
+        return node_payload
+
+    def _invalidate(self):
+        if self._cache is not None:
+            self._cache.cache_clear()
+        if self.instruments is not None:
+            self.instruments.invalidate()
+        for parent in self._parents:
+            parent._invalidate()
+
+    def register(self, path: str, methods: HTTPMethods = None,
+                 converters: t.Optional[t.Mapping[str, t.Any]] = None,
+                 **metadata):
+        path, converter = route_converter(path, converters)
+        path = sys.intern(path)
+        if self.compact and metadata:
+            metadata = self._shared(metadata)
 
-    def register(self, path: str, methods: HTTPMethods = None, **metadata):
         def routing(view):
+            if converter is not None:
+                self._converters[path] = converter
+            if self.lazy:
+                lazy = LazyView(
+                    view, methods, self.extractor, metadata or None)
+                node_payload = self.add(path, lazy.payload(
+                    utils.extracted_methods(self.extractor, view, methods)))
+                if node_payload is not None:
+                    lazy.payloads.append(node_payload)
+                return view
             for endpoint, verbs in self.extractor(view, methods):
                 self.add(path, {
-                    method: RouteEndpoint(
-                        endpoint=endpoint,
-                        method=method,
-                        metadata=metadata or None
-                    ) for method in verbs
+                    method: utils.route_endpoint(
+                        method, endpoint, metadata or None)
+                    for method in verbs
                 })
             return view
         return routing
 
-    def match_method(self, path_info: str, method: HTTPMethod) -> Route:
-        found, params = self.match(path_info)
-        if found is None:
+    def _shared(self, metadata: dict) -> dict:
+        try:
+            key = frozenset(metadata.items())
+        except TypeError:
+            # Unhashable values, such as the lists of guards.
+            return metadata
+        return self._metadata.setdefault(key, metadata)
+
+    def _converted(self, found: t.Dict[HTTPMethod, RouteEndpoint],
+                   params: dict) -> t.Optional[dict]:
+        # Returns None if the params can't be converted.
+        convert = self._convert.get(id(found))
+        if convert is None:
+            return params
+        try:
+            return convert(params)
+        except (ValueError, TypeError):
             return None
+
+    def _flat_converters(self) -> t.Iterator[t.Tuple[str, RouteConverter]]:
+        yield from self._converters.items()
+        for mount in self._mounts:
+            for path, converter in mount.router._flat_converters():
+                yield mount.prefix + path, converter
+
+    def match(self, path_info: str):
+        found = self._static.get(path_info)
+        if found is not None:
+            return found, {}
+        found, params = self._dynamic(path_info)
+        if found is None and self._mounts:
+            mount, rest = self._mount_of(path_info)
+            if mount is not None:
+                return mount.router.match(rest)
+        return found, params
+
+    def mount(self, prefix: str, router: 'Routes',
+              namespace: t.Optional[str] = None):
+        """Delegates the paths under the prefix to the router, without
+        copying its routes: its later changes apply. The routes of this
+        router take precedence.
+        """
+        if self._table is not None:
+            raise TypeError("Frozen routes can't be modified.")
+        if not isinstance(router, Routes):
+            raise TypeError(f"Can't mount {router.__class__!r}.")
+        prefix = prefix.rstrip('/')
+        if not prefix.startswith('/'):
+            raise ValueError(f'Invalid mount prefix: {prefix!r}.')
+        for mount in self._mounts:
+            if mount.prefix == prefix:
+                raise ValueError(f'Prefix {prefix!r} is already mounted.')
+            if namespace is not None and mount.namespace == namespace:
+                raise NameError(
+                    f'Namespace {namespace!r} is already mounted '
+                    f'on {mount.prefix!r}.')
+        self._mounts = tuple(sorted(
+            (*self._mounts, Mount(prefix, router, namespace)),
+            key=lambda mount: -len(mount.prefix)))
+        router._parents.append(self)
+        self._invalidate()
+
+    def _mount_of(self, path_info: str) \
+            -> t.Tuple[t.Optional[Mount], t.Optional[str]]:
+        for mount in self._mounts:
+            if path_info.startswith(mount.prefix):
+                rest = path_info[len(mount.prefix):]
+                if rest[:1] == '/':
+                    return mount, rest
+        return None, None
+
+    def _mounted(self, path_info: str, method: HTTPMethod) \
+            -> t.Union[Route, str, None]:
+        mount, rest = self._mount_of(path_info)
+        if mount is None:
+            return None
+        route = mount.router._resolve(rest, method)
+        if route is None or route.__class__ is str:
+            return route
+        return Route(path_info, route.endpoint, route.params)
+
+    def _allowance(self, payload: t.Dict[HTTPMethod, RouteEndpoint]) \
+            -> Allowance:
+        mask = 0
+        for method in payload:
+            mask |= method_bit(method)
+        return allowance(mask, self.auto_head, self.auto_options)
+
+    def _fallback(self, path_info: str, method: HTTPMethod,
+                  found: t.Dict[HTTPMethod, RouteEndpoint], params: dict) \
+            -> t.Union[Route, str]:
+        allowance = self._allowed.get(id(found))
+        if allowance is None:
+            # Payloads that were not inserted, such as the frozen ones.
+            allowance = self._allowed[id(found)] = self._allowance(found)
+        if method == 'HEAD' and self.auto_head:
+            endpoint = found.get('GET')
+            if endpoint is not None:
+                return Route(path_info, endpoint, params)
+        elif method == 'OPTIONS' and allowance.options is not None:
+            return Route(path_info, allowance.options, params)
+        return allowance.header
+
+    def _lookup(self, path_info: str, method: HTTPMethod) \
+            -> t.Union[Route, str, None]:
+        # Returns the Allow header value if the method is not allowed.
+        found = self._static.get(path_info)
+        if found is not None:
+            params = {}
+        else:
+            found, params = self._dynamic(path_info)
+            if found is None:
+                if self._mounts:
+                    return self._mounted(path_info, method)
+                return None
+            if self._convert:
+                params = self._converted(found, params)
+                if params is None:
+                    return None
         endpoint = found.get(method)
         if endpoint is None:
-            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+            return self._fallback(path_info, method, found, params)
+        # Positional arguments: keywords are notably slower.
+        return Route(path_info, endpoint, params)
 
-        return Route(
-            path=path_info,
-            params=params,
-            endpoint=endpoint,
-        )
+    def _cached(self, path_info: str, method: HTTPMethod) \
+            -> t.Union[Route, str, None]:
+        route = self._cache(path_info, method)
+        if route.__class__ is Route and route.params:
+            # The memoized params are not handed out: callers may
+            # change them.
+            return Route(route.path, route.endpoint, dict(route.params))
+        return route
+
+    def match_method(self, path_info: str, method: HTTPMethod) -> Route:
+        route = self._resolve(path_info, method)
+        if route.__class__ is str:
+            raise MethodNotAllowed(route)
+        return route
+
+    def dispatch(self, path_info: str, method: HTTPMethod, request) \
+            -> t.Any:
+        """Calls the endpoint of the route with the request and the params
+        and returns the result, or None if no route matches. Raises
+        MethodNotAllowed as `match_method`.
+        No route is built on the common path: the endpoint is called
+        right out of the payload. The results cache and the
+        instrumentation, when enabled, still apply.
+        """
+        if self._cache is None and self.instruments is None:
+            found = self._static.get(path_info)
+            if found is not None:
+                endpoint = found.get(method)
+                if endpoint is not None:
+                    return endpoint.endpoint(request)
+            else:
+                found, params = self._dynamic(path_info)
+                if found is None:
+                    if not self._mounts:
+                        return None
+                else:
+                    endpoint = found.get(method)
+                    if endpoint is not None:
+                        if self._convert:
+                            params = self._converted(found, params)
+                            if params is None:
+                                return None
+                        return endpoint.endpoint(request, **params)
+        route = self.match_method(path_info, method)
+        if route is None:
+            return None
+        return route.endpoint(request, **route.params)
+
+    def _matched(self, path_info: str) \
+            -> t.Tuple[t.Optional['Routes'],
+                       t.Optional[t.Dict[HTTPMethod, RouteEndpoint]],
+                       t.Optional[dict]]:
+        # Returns the router holding the payload, the payload and the
+        # converted params, as `_lookup` resolves them.
+        found = self._static.get(path_info)
+        if found is not None:
+            return self, found, {}
+        found, params = self._dynamic(path_info)
+        if found is None:
+            if self._mounts:
+                mount, rest = self._mount_of(path_info)
+                if mount is not None:
+                    return mount.router._matched(rest)
+            return None, None, None
+        if self._convert:
+            params = self._converted(found, params)
+            if params is None:
+                return None, None, None
+        return self, found, params
+
+    def match_many(self, requests: t.Iterable[t.Tuple[str, HTTPMethod]],
+                   memo_size: int = 4096) \
+            -> t.Iterator[t.Union[Route, HTTPStatus]]:
+        """Matches `(path_info, method)` couples, yielding a route or the
+        404/405 status for each of them, in order, without raising.
+        Identical paths are matched once: the outcomes are memoized by
+        path, up to `memo_size` paths. The results cache and the
+        instrumentation are bypassed.
+        """
+        memo = {}
+        matched = self._matched
+        for path_info, method in requests:
+            outcomes = memo.get(path_info)
+            if outcomes is None:
+                if len(memo) >= memo_size:
+                    memo.clear()
+                outcomes = memo[path_info] = (*matched(path_info), {})
+            owner, found, params, routes = outcomes
+            if found is None:
+                yield NOT_FOUND
+                continue
+            route = routes.get(method)
+            if route is None:
+                endpoint = found.get(method)
+                if endpoint is not None:
+                    route = Route(path_info, endpoint, params)
+                else:
+                    route = owner._fallback(
+                        path_info, method, found, params)
+                    if route.__class__ is str:
+                        route = METHOD_NOT_ALLOWED
+                routes[method] = route
+            yield route
+
+    def instrument(self, buckets: t.Sequence[int] = BUCKETS) \
+            -> Instrumentation:
+        """Starts recording the hits, the 404 and 405 outcomes and the
+        endpoints calls latencies. The matched routes endpoints are then
+        timing their calls.
+        """
+        if self.instruments is None:
+            self.instruments = Instrumentation(self, self._resolve, buckets)
+            self._resolve = self.instruments.resolve
+        return self.instruments
+
+    def uninstrument(self):
+        if self.instruments is not None:
+            self._resolve = self.instruments.resolve_route
+            self.instruments = None
 
     def __iter__(self):
-        def route_iterator(edges):
-            if edges:
-                for edge in edges:
-                    if edge.child.path:
-                        yield RouteDefinition(
-                            path=edge.child.path,
-                            payload=edge.child.payload)
-                    yield from route_iterator(edge.child.edges)
-        yield from route_iterator(self.root.edges)
+        return self.query()
+
+    def _walk(self, literal: str = '') -> t.Iterator[RouteDefinition]:
+        # Depth first, with an explicit stack of the edges iterators.
+        # The subtrees whose literal prefix can't start with `literal`
+        # are skipped: the edges patterns are compared up to their first
+        # placeholder, whose name may differ from the one of the route.
+        stack = [(iter(self.root.edges or ()), '')]
+        while stack:
+            edges, prefix = stack[-1]
+            edge = next(edges, None)
+            if edge is None:
+                stack.pop()
+                continue
+            child = edge.child
+            start = len(prefix)
+            if start < len(literal) and '{' not in prefix:
+                pattern = edge.pattern.partition('{')[0]
+                if not literal.startswith(
+                        pattern[:len(literal) - start], start):
+                    continue
+            if child.path:
+                yield RouteDefinition(path=child.path, payload=child.payload)
+            if child.edges:
+                stack.append((iter(child.edges), prefix + edge.pattern))
+
+    def query(self, prefix: str = '',
+              method: t.Optional[HTTPMethod] = None,
+              key: t.Optional[str] = None) -> t.Iterator[RouteDefinition]:
+        """Iterates over the route definitions, mounted routes included,
+        filtered by path prefix, by method and by metadata key.
+        """
+        if self._table is not None:
+            routedefs = iter(self._table.definitions)
+        else:
+            routedefs = self._walk(prefix.partition('{')[0])
+        for routedef in routedefs:
+            if prefix and not routedef.path.startswith(prefix):
+                continue
+            if method is not None and method not in routedef.payload:
+                continue
+            if key is not None and not any(
+                    endpoint.metadata and key in endpoint.metadata
+                    for endpoint in routedef.payload.values()):
+                continue
+            yield routedef
+        for mount in self._mounts:
+            if mount.prefix.startswith(prefix):
+                local = ''
+            elif prefix.startswith(mount.prefix):
+                local = prefix[len(mount.prefix):]
+            else:
+                continue
+            for routedef in mount.router.query(local, method, key):
+                yield RouteDefinition(
+                    path=mount.prefix + routedef.path,
+                    payload=routedef.payload)
+
+    def spawn(self) -> 'Routes':
+        """Returns an empty router with the same configuration.
+        """
+        return self.__class__(**self.settings)
+
+    def freeze(self) -> 'Routes':
+        """Returns a read-only copy of the router, compiled into a flat
+        table. Frozen routes can still be merged into other routers.
+        """
+        return self._frozen(FlatTable(self), dict(self._flat_converters()))
+
+    def _frozen(self, table: FlatTable,
+                converters: t.Dict[str, RouteConverter]) -> 'Routes':
+        frozen = self.spawn()
+        frozen._static = table.static
+        frozen._dynamic = table.match
+        frozen._converters = converters
+        for path, payload in table.definitions:
+            converter = frozen._converters.get(path)
+            if converter is not None:
+                frozen._convert[id(payload)] = converter.convert
+        frozen._table = table
+        return frozen
+
+    def merge(self, *routers: 'Routes'):
+        """Adds the routes of the given routers, in place.
+        """
+        if self._table is not None:
+            raise TypeError("Frozen routes can't be modified.")
+        for router in routers:
+            if not isinstance(router, Routes):
+                raise TypeError(
+                    f"Can't merge {router.__class__!r} into {self.__class__!r}.")
+        for router in routers:
+            self._converters.update(router._flat_converters())
+            for routedef in router:
+                self._insert(routedef.path, routedef.payload)
+        self._invalidate()
+
+    def __iadd__(self, router: 'Routes'):
+        if not isinstance(router, Routes):
+            return NotImplemented
+        self.merge(router)
+        return self
 
     def __add__(self, router: 'Routes'):
         if not isinstance(router, Routes):
             raise TypeError(
-                "unsupported operand type(s) for +: '{self.__class__}'"
-                "and '{router.__class__}'")
-        routes = self.__class__()
-        for routedef in self:
-            routes.add(routedef.path, routedef.payload)
-        for routedef in router:
-            routes.add(routedef.path, routedef.payload)
+                f"unsupported operand type(s) for +: '{self.__class__}' "
+                f"and '{router.__class__}'")
+        routes = self.spawn()
+        routes.merge(self, router)
         return routes
 
 
 class NamedRoutes(Routes):
 
-    __slots__ = ('_names')
+    __slots__ = ('_names', '_urls')
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._names = {}
+        self._urls = {}
 
     @property
     def names_mapping(self):
         return self._names.items()
 
     def has_route(self, name: str):
-        return name in self._names
+        if name in self._names:
+            return True
+        mount, name = self._namespaced(name)
+        return mount is not None and mount.router.has_route(name)
+
+    def _builder(self, path: str) -> URLBuilder:
+        converter = self._converters.get(path)
+        if converter is None:
+            return URLBuilder(path)
+        return URLBuilder(path, converter.to_url)
+
+    def _namespaced(self, name: str) \
+            -> t.Tuple[t.Optional[Mount], t.Optional[str]]:
+        namespace, sep, name = name.partition(':')
+        if sep:
+            for mount in self._mounts:
+                if mount.namespace == namespace \
+                        and isinstance(mount.router, NamedRoutes):
+                    return mount, name
+        return None, None
+
+    def _flat_names(self) -> t.Iterator[t.Tuple[str, str]]:
+        # The names of the mounted routers, namespaced and prefixed.
+        yield from self._names.items()
+        for mount in self._mounts:
+            if mount.namespace is not None \
+                    and isinstance(mount.router, NamedRoutes):
+                for name, path in mount.router._flat_names():
+                    yield f'{mount.namespace}:{name}', mount.prefix + path
 
-    def url_for(self, name: str, **params):
+    def _compiled(self, name: str) -> t.Optional[URLBuilder]:
+        # Compact routes compile the URL builders on their first use.
         path = self._names.get(name)
         if path is None:
-            raise LookupError(f'Unknown route `{name}`.')
+            return None
+        return self._urls.setdefault(name, self._builder(path))
+
+    def url_for(self, name: str, /, **params):
+        builder = self._urls.get(name) or self._compiled(name)
+        if builder is None:
+            mount, local = self._namespaced(name)
+            if mount is None:
+                raise LookupError(f'Unknown route `{name}`.')
+            return mount.prefix + mount.router.url_for(local, **params)
         try:
             # Raises a KeyError too if some param misses
-            return path.format(**params)
+            return builder.build(params)
         except KeyError:
             raise ValueError(
                 f"No route found with name {name} and params {params}.")
 
+    def url_for_many(self, name: str,
+                     params: t.Optional[t.Iterable[t.Mapping]] = None, /,
+                     **columns: t.Sequence) -> t.List[str]:
+        builder = self._urls.get(name) or self._compiled(name)
+        if builder is None:
+            mount, local = self._namespaced(name)
+            if mount is None:
+                raise LookupError(f'Unknown route `{name}`.')
+            prefix = mount.prefix
+            return [
+                prefix + url for url in
+                mount.router.url_for_many(local, params, **columns)
+            ]
+        if columns:
+            if params is not None:
+                raise TypeError(
+                    'Params are given either as mappings or as columns.')
+            if len(set(map(len, columns.values()))) > 1:
+                raise ValueError('Params columns differ in length.')
+            if columns.keys() == builder.names:
+                return builder.build_columns(columns)
+            keys = tuple(columns)
+            params = map(dict, map(zip, repeat(keys), zip(*columns.values())))
+        elif params is None:
+            return []
+        try:
+            return list(map(builder.build, params))
+        except KeyError as exc:
+            raise ValueError(
+                f"No route found with name {name} "
+                f"and missing param {exc.args[0]!r}.")
+
+    def invalidate(self, name: str):
+        """Drops the cached responses of the named route, of this router
+        or of the mounted router for a namespaced name only.
+        """
+        path = self._names.get(name)
+        if path is None:
+            mount, local = self._namespaced(name)
+            if mount is None or not mount.router.has_route(local):
+                raise LookupError(f'Unknown route `{name}`.')
+            mount.router.invalidate(local)
+            return
+        RESPONSES.invalidate_endpoints(
+            endpoint for routedef in self.query(path)
+            if routedef.path == path
+            for endpoint in routedef.payload.values()
+            if endpoint.metadata and endpoint.metadata.get('name') == name
+        )
+
+    def freeze(self) -> 'NamedRoutes':
+        frozen = super().freeze()
+        frozen._names = dict(self._flat_names())
+        if self.compact:
+            frozen._urls = {
+                name: self._urls[name]
+                for name in frozen._names if name in self._urls
+            }
+        else:
+            frozen._urls = {
+                name: self._urls.get(name) or frozen._builder(path)
+                for name, path in frozen._names.items()
+            }
+        return frozen
+
+    def merge(self, *routers: Routes):
+        # Names are checked beforehand, for all the routers at once:
+        # nothing is merged if a name conflicts.
+        names = dict(self._names)
+        urls = {}
+        for router in routers:
+            if isinstance(router, NamedRoutes):
+                mapping = router._flat_names()
+                urls.update(router._urls)
+            elif isinstance(router, Routes):
+                mapping = (
+                    (endpoint.metadata['name'], routedef.path)
+                    for routedef in router
+                    for endpoint in routedef.payload.values()
+                    if endpoint.metadata and 'name' in endpoint.metadata
+                )
+            else:
+                mapping = ()
+            for name, path in mapping:
+                if found := names.get(name):
+                    if path != found:
+                        raise NameError(
+                            f"Route {name!r} already exists "
+                            f"for path {found!r}.")
+                else:
+                    names[name] = path
+        super().merge(*routers)
+        for name, path in names.items():
+            if name not in self._urls:
+                builder = urls.get(name)
+                if builder is not None:
+                    self._urls[name] = builder
+                elif not self.compact:
+                    self._urls[name] = self._builder(path)
+        self._names = names
+
     def add(self, path: str, payload: t.Dict[HTTPMethod, RouteEndpoint]):
         for verb, endpoint in payload.items():
             if not endpoint.metadata or not 'name' in endpoint.metadata:
@@ -107,5 +812,8 @@ class NamedRoutes(Routes):
                 if path != found:
                     raise NameError(
                         f"Route {name!r} already exists for path {found!r}.")
-            self._names[name] = path
+            else:
+                self._names[name] = path
+                if not self.compact:
+                    self._urls[name] = self._builder(path)
         return super().add(path, payload)
@@ -0,0 +1,118 @@
+"""Typed params.
+
+A converter turns the matched string into a value, and the value back
+into a string when building URLs. Converters are declared in the
+placeholder, `{id:int}`, or through a `converters` mapping at
+registration. The placeholder is routed on the match type of the
+converter.
+"""
+import datetime
+import typing as t
+import uuid
+
+from roughrider.routing.urls import PLACEHOLDER, compile_source
+
+
+class Converter(t.NamedTuple):
+    match_type: str  # autoroutes match type, or regular expression.
+    to_python: t.Callable[[str], t.Any]
+    to_url: t.Callable[[t.Any], str] = str
+
+
+# Converters by name. Registering converters here makes them available
+# in the placeholders, and serializable in snapshots.
+CONVERTERS = {
+    'int': Converter('digit', int),
+    'float': Converter('[0-9]+[.]?[0-9]*', float),
+    'uuid': Converter('[0-9a-fA-F-]+', uuid.UUID),
+    'date': Converter(
+        '[0-9]+-[0-9]+-[0-9]+', datetime.date.fromisoformat,
+        datetime.date.isoformat),
+}
+
+
+class RouteConverter:
+    """Converters of the params of a route path, compiled into a single
+    function returning the converted params.
+    """
+    __slots__ = ('converters', 'convert', 'to_url')
+
+    def __init__(self, converters: t.Mapping[str, Converter]):
+        self.converters = dict(converters)
+        self.to_url = {
+            name: converter.to_url
+            for name, converter in self.converters.items()
+        }
+        namespace = {}
+        items = []
+        for i, (name, converter) in enumerate(self.converters.items()):
+            namespace[f'c{i}'] = converter.to_python
+            items.append(f'{name!r}: c{i}(params[{name!r}])')
+        exec(compile_source(
+            'def convert(params):\n'
+            f"    return {{**params, {', '.join(items)}}}"), namespace)
+        self.convert = namespace['convert']
+
+    def __repr__(self):
+        return f'<RouteConverter {sorted(self.converters)}>'
+
+    def names(self) -> t.Dict[str, str]:
+        """Returns the registered names of the converters.
+        """
+        registered = {
+            converter: name for name, converter in CONVERTERS.items()}
+        names = {}
+        for param, converter in self.converters.items():
+            name = registered.get(converter)
+            if name is None:
+                raise ValueError(
+                    f'Converter of {param!r} is not registered: '
+                    f'{converter!r}.')
+            names[param] = name
+        return names
+
+
+def converter(spec: t.Union[str, Converter, t.Callable[[str], t.Any]],
+              match_type: t.Optional[str]) -> Converter:
+    if spec.__class__ is str:
+        found = CONVERTERS.get(spec)
+        if found is None:
+            raise ValueError(f'Unknown converter: {spec!r}.')
+        return found
+    if isinstance(spec, Converter):
+        return spec
+    if callable(spec):
+        return Converter(match_type or 'string', spec)
+    raise TypeError(f'Invalid converter: {spec!r}.')
+
+
+def route_converter(
+        path: str, converters: t.Optional[t.Mapping[str, t.Any]] = None) \
+        -> t.Tuple[str, t.Optional[RouteConverter]]:
+    """Returns the path to route, the converters names being replaced
+    by their match type, and the converter of the route params, if any.
+    A match type given in the placeholder takes precedence over the one
+    of a converter from the mapping.
+    """
+    converters = dict(converters or {})
+    found = {}
+
+    def replace(placeholder):
+        name, match_type = placeholder.groups()
+        spec = converters.pop(name, None)
+        if spec is None:
+            if match_type not in CONVERTERS:
+                return placeholder.group(0)
+            spec, match_type = match_type, None
+        elif match_type in CONVERTERS:
+            match_type = None
+        found[name] = converter(spec, match_type)
+        return f'{{{name}:{match_type or found[name].match_type}}}'
+
+    routed = PLACEHOLDER.sub(replace, path)
+    if converters:
+        raise ValueError(
+            f"Converters of unknown params: {', '.join(converters)}.")
+    if not found:
+        return routed, None
+    return routed, RouteConverter(found)
@@ -0,0 +1,273 @@
+import re
+import typing as t
+
+import autoroutes
+from horseman.types import HTTPMethod
+from roughrider.routing.meta import RouteDefinition, RouteEndpoint
+from roughrider.routing.urls import Placeholder, parse, MULTI_SEGMENTS
+
+
+Payload = t.Dict[HTTPMethod, RouteEndpoint]
+
+# Transitions kinds.
+SINGLE, PATTERN, TAIL = 0, 1, 2
+
+# Checks of a whole segment consisting of a single placeholder,
+# mirroring the autoroutes matching. Segments never contain a slash.
+CHECKS = {
+    'alnum': str.isalnum,
+    'alpha': str.isalpha,
+    'digit': str.isdigit,
+    'string': bool,
+}
+
+
+def pattern(placeholder: Placeholder) -> str:
+    if placeholder.match_type in autoroutes.MATCH_TYPES:
+        return autoroutes.PATTERNS[
+            autoroutes.MATCH_TYPES[placeholder.match_type]]
+    return placeholder.match_type
+
+
+def compile_parts(parts: t.Iterable[t.Union[str, Placeholder]]) \
+        -> t.Tuple[t.Callable[[str], t.Optional[t.Match]],
+                   t.Tuple[t.Tuple[str, str], ...]]:
+    """Compiles the parts into a regular expression. The placeholders
+    are captured in named groups: the expression of a placeholder can
+    hold groups of its own. Returns the `fullmatch` method of the
+    expression and the `(slug, group name)` couples.
+    """
+    regex = []
+    slugs = []
+    for part in parts:
+        if part.__class__ is str:
+            regex.append(re.escape(part))
+        else:
+            group = f'_{len(slugs)}'
+            regex.append(f'(?P<{group}>{pattern(part)})')
+            slugs.append((part.name, group))
+    return re.compile(''.join(regex)).fullmatch, tuple(slugs)
+
+
+def split(path: str) -> t.List[t.List[t.Union[str, Placeholder]]]:
+    """Splits a route path in segments, on the slashes that are not
+    part of a placeholder.
+    """
+    segments = [[]]
+    for part in parse(path):
+        if part.__class__ is str:
+            first, *others = part.split('/')
+            if first:
+                segments[-1].append(first)
+            segments.extend([other] if other else [] for other in others)
+        else:
+            segments[-1].append(part)
+    return segments
+
+
+def is_tail(segment: t.List[t.Union[str, Placeholder]]) -> bool:
+    # Placeholders that may match a slash consume the rest of the path.
+    return any(
+        part.__class__ is Placeholder and (
+            part.match_type in MULTI_SEGMENTS
+            or part.match_type not in CHECKS)
+        for part in segment
+    )
+
+
+class FlatTable:
+    """Read-only routing table, compiled out of route definitions.
+
+    Nodes are indexes in flat arrays: `statics` holds the literal
+    segments dict of each node, `dynamics` the precompiled placeholder
+    transitions and `payloads` the payloads of the routes ending on the
+    node. Literal segments take precedence over placeholders, tried in
+    the registration order. Placeholders that may match a slash match
+    the rest of the path at once. The table backtracks where the trie
+    doesn't: the paths it serves are served the same, unless several
+    routes match them, which `analysis.analyze` reports as ambiguous.
+    The precedence then differs: with `/{p:path}` registered before
+    `/b/{x:alnum}/a`, the trie serves `/b/a/a` with the former, the
+    table with the latter, its literal segment taking precedence.
+    Literal paths are not part of the nodes: they are exposed through
+    the `static` mapping, to be looked up beforehand.
+
+    The lookups walk the segments in Python: benchmarks/frozen.py
+    measures them at x0.9 to x1.1 the speed of the Cython trie. The
+    misses of the tables having alternatives to the greedy walk run
+    the exhaustive search, slower. The gain is the memory, a fifth
+    less per route, and the linear build.
+    """
+    __slots__ = ('definitions', 'static', 'statics', 'dynamics', 'payloads',
+                 'nodes', 'forked')
+
+    def __init__(self, definitions: t.Iterable[RouteDefinition]):
+        self.definitions = tuple(
+            RouteDefinition(path=path, payload=dict(payload))
+            for path, payload in definitions
+        )
+        self.static = {}
+        statics = [{}]
+        dynamics = [[]]
+        payloads = [None]
+        keys = [{}]
+
+        def new_node():
+            statics.append({})
+            dynamics.append([])
+            payloads.append(None)
+            keys.append({})
+            return len(payloads) - 1
+
+        for path, payload in self.definitions:
+            if '{' not in path:
+                self.static[path] = payload
+                continue
+            node = 0
+            segments = split(path)
+            for position, segment in enumerate(segments):
+                if is_tail(segment):
+                    parts = []
+                    for rest in segments[position:]:
+                        parts.extend(rest)
+                        parts.append('/')
+                    parts.pop()
+                    fullmatch, slugs = compile_parts(parts)
+                    dynamics[node].append((TAIL, fullmatch, slugs, payload))
+                    break
+                if all(part.__class__ is str for part in segment):
+                    literal = ''.join(segment)
+                    child = statics[node].get(literal)
+                    if child is None:
+                        child = statics[node][literal] = new_node()
+                else:
+                    if len(segment) == 1:
+                        placeholder = segment[0]
+                        key = (SINGLE, placeholder)
+                        transition = (
+                            SINGLE, CHECKS[placeholder.match_type],
+                            placeholder.name)
+                    else:
+                        key = (PATTERN, tuple(segment))
+                        transition = (PATTERN, *compile_parts(segment))
+                    child = keys[node].get(key)
+                    if child is None:
+                        child = keys[node][key] = new_node()
+                        dynamics[node].append((*transition, child))
+                node = child
+            else:
+                if payloads[node] is None:
+                    payloads[node] = payload
+                else:
+                    # Same placeholders, written differently.
+                    payloads[node] = {**payloads[node], **payload}
+
+        self.statics = tuple(statics)
+        self.dynamics = tuple(map(tuple, dynamics))
+        self.payloads = tuple(payloads)
+        # The literal segments and the first placeholder transition of
+        # each node, if single: the greedy walk follows them only.
+        self.nodes = tuple(
+            (literals, transitions[0][1:]
+             if transitions and transitions[0][0] == SINGLE else None)
+            for literals, transitions in zip(self.statics, self.dynamics)
+        )
+        # Whether a path can have alternatives to the greedy walk.
+        self.forked = any(
+            len(transitions) > 1 or (transitions and (
+                literals or transitions[0][0] != SINGLE))
+            for literals, transitions in zip(self.statics, self.dynamics)
+        )
+
+    def match(self, path: str) -> t.Tuple[t.Optional[Payload],
+                                          t.Optional[t.Dict[str, str]]]:
+        # Greedy walk, following the literal segment or else the first
+        # placeholder: this is the first path explored by the search,
+        # run on failure if the table has alternatives.
+        nodes = self.nodes
+        params = {}
+        node = 0
+        for segment in path.split('/'):
+            literals, single = nodes[node]
+            child = literals.get(segment)
+            if child is None:
+                if single is None or not single[0](segment):
+                    break
+                params[single[1]] = segment
+                child = single[2]
+            node = child
+        else:
+            payload = self.payloads[node]
+            if payload is not None:
+                return payload, params
+        if self.forked:
+            return self.search(path.split('/'))
+        return None, None
+
+    def search(self, segments: t.List[str]) \
+            -> t.Tuple[t.Optional[Payload], t.Optional[t.Dict[str, str]]]:
+        statics = self.statics
+        dynamics = self.dynamics
+        end = len(segments)
+        values = []
+        # Alternatives to backtrack to: (node, index, values, position).
+        pending = []
+        node = index = 0
+        position = -1
+        while True:
+            if position == -1:
+                if index == end:
+                    payload = self.payloads[node]
+                    if payload is not None:
+                        return payload, dict(values)
+                else:
+                    child = statics[node].get(segments[index])
+                    if child is not None:
+                        if dynamics[node]:
+                            pending.append((node, index, len(values), 0))
+                        node = child
+                        index += 1
+                        continue
+                position = 0
+
+            if index < end:
+                transitions = dynamics[node]
+                total = len(transitions)
+                segment = segments[index]
+                while position < total:
+                    kind, test, slugs, target = transitions[position]
+                    position += 1
+                    if kind == SINGLE:
+                        if test(segment):
+                            if position < total:
+                                pending.append(
+                                    (node, index, len(values), position))
+                            values.append((slugs, segment))
+                            break
+                    elif kind == PATTERN:
+                        found = test(segment)
+                        if found is not None:
+                            if position < total:
+                                pending.append(
+                                    (node, index, len(values), position))
+                            values.extend(
+                                (slug, found[group]) for slug, group in slugs)
+                            break
+                    else:
+                        found = test('/'.join(segments[index:]))
+                        if found is not None:
+                            values.extend(
+                                (slug, found[group]) for slug, group in slugs)
+                            return target, dict(values)
+                else:
+                    target = None
+                if target is not None:
+                    node = target
+                    index += 1
+                    position = -1
+                    continue
+
+            if not pending:
+                return None, None
+            node, index, count, position = pending.pop()
+            del values[count:]
@@ -0,0 +1,169 @@
+"""Host-aware routing.
+
+The host is resolved before the path: exact hosts through a dict, then
+the wildcard hosts patterns, in the registration order. Hosts patterns
+use the placeholders of the paths: `{tenant}.example.com`.
+"""
+import re
+import typing as t
+
+import autoroutes
+from horseman.types import HTTPMethod
+from roughrider.routing.components import Routes, NamedRoutes
+from roughrider.routing.meta import Route
+from roughrider.routing.urls import URLBuilder, Placeholder, parse
+
+
+# A placeholder matches a single label of the host.
+LABEL = r'[^.]+'
+
+
+class Host(t.NamedTuple):
+    pattern: str
+    routes: NamedRoutes
+    match: t.Optional[t.Callable[[str], t.Optional[t.Match]]]
+    builder: URLBuilder
+
+
+def hostname(host: str) -> str:
+    # The port is not part of the routing. IPv6 hosts are bracketed.
+    host = host.lower()
+    if not host.endswith(']'):
+        name, sep, port = host.rpartition(':')
+        if sep and port.isdigit():
+            return name
+    return host
+
+
+def compile_host(pattern: str) \
+        -> t.Callable[[str], t.Optional[t.Match]]:
+    regex = []
+    for part in parse(pattern):
+        if part.__class__ is Placeholder:
+            if part.match_type == autoroutes.DEFAULT_MATCH_TYPE:
+                expression = LABEL
+            elif part.match_type in autoroutes.MATCH_TYPES:
+                expression = autoroutes.PATTERNS[
+                    autoroutes.MATCH_TYPES[part.match_type]]
+            else:
+                expression = part.match_type
+            regex.append(f'(?P<{part.name}>{expression})')
+        else:
+            regex.append(re.escape(part))
+    return re.compile(''.join(regex), re.IGNORECASE).fullmatch
+
+
+class HostRoutes(NamedRoutes):
+    """Routes dispatching on the host before the path. The routes of
+    the router itself serve the requests of any other host.
+    """
+    __slots__ = ('_hosts', '_patterns', '_host_names')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._hosts = {}
+        self._patterns = []
+        # Hosts of the route names, indexed on demand.
+        self._host_names = {}
+
+    def host(self, pattern: str,
+             routes: t.Optional[NamedRoutes] = None) -> NamedRoutes:
+        """Returns the routes of the host pattern, created if needed.
+        """
+        pattern = pattern.lower()
+        found = self._hosts.get(pattern)
+        if found is None:
+            for entry in self._patterns:
+                if entry.pattern == pattern:
+                    found = entry
+                    break
+        if found is not None:
+            if routes is not None and routes is not found.routes:
+                raise ValueError(f'Host {pattern!r} is already routed.')
+            return found.routes
+
+        if routes is None:
+            routes = NamedRoutes(**self.settings)
+        elif not isinstance(routes, NamedRoutes):
+            raise TypeError(f'Host routes must be NamedRoutes: {routes!r}.')
+        if '{' in pattern:
+            self._patterns.append(Host(
+                pattern, routes, compile_host(pattern), URLBuilder(pattern)))
+        else:
+            self._hosts[pattern] = Host(
+                pattern, routes, None, URLBuilder(pattern))
+        return routes
+
+    def freeze(self) -> 'HostRoutes':
+        frozen = super().freeze()
+        frozen._hosts = {
+            pattern: entry._replace(routes=entry.routes.freeze())
+            for pattern, entry in self._hosts.items()
+        }
+        frozen._patterns = [
+            entry._replace(routes=entry.routes.freeze())
+            for entry in self._patterns
+        ]
+        return frozen
+
+    def resolve_host(self, host: str) \
+            -> t.Tuple[Routes, t.Optional[t.Dict[str, str]]]:
+        name = hostname(host)
+        found = self._hosts.get(name)
+        if found is not None:
+            return found.routes, None
+        for entry in self._patterns:
+            matched = entry.match(name)
+            if matched is not None:
+                return entry.routes, matched.groupdict()
+        return self, None
+
+    def match(self, path_info: str, host: t.Optional[str] = None):
+        if host is not None:
+            routes, params = self.resolve_host(host)
+            if routes is not self:
+                found, path_params = routes.match(path_info)
+                if found is not None and params:
+                    path_params = {**params, **path_params}
+                return found, path_params
+        return super().match(path_info)
+
+    def match_method(self, path_info: str, method: HTTPMethod,
+                     host: t.Optional[str] = None) -> t.Optional[Route]:
+        if host is not None:
+            routes, params = self.resolve_host(host)
+            if routes is not self:
+                route = routes.match_method(path_info, method)
+                if route is not None and params:
+                    route = Route(
+                        route.path, route.endpoint,
+                        {**params, **route.params})
+                return route
+        return super().match_method(path_info, method)
+
+    def url_for(self, name: str, /, **params) -> str:
+        """Returns the URL of the route, scheme relative if the route
+        is bound to a host: `//host/path`. The params of the host
+        placeholders are consumed by the host.
+        """
+        if self.has_route(name):
+            return super().url_for(name, **params)
+        entry = self._host_names.get(name)
+        if entry is None:
+            for entry in (*self._hosts.values(), *self._patterns):
+                for known in entry.routes._names:
+                    self._host_names.setdefault(known, entry)
+            entry = self._host_names.get(name)
+            if entry is None:
+                raise LookupError(f'Unknown route `{name}`.')
+        host_params = {
+            key: params.pop(key) for key in entry.builder.names
+            if key in params
+        }
+        try:
+            host = entry.builder.build(host_params)
+        except KeyError as exc:
+            raise ValueError(
+                f"No route found with name {name} "
+                f"and missing host param {exc.args[0]!r}.")
+        return f'//{host}{entry.routes.url_for(name, **params)}'
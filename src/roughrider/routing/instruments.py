@@ -0,0 +1,251 @@
+"""Opt-in instrumentation of the routes.
+
+Each thread records its own counters: the request path only writes
+counters owned by the current thread, without any lock. A snapshot
+aggregates the counters of all the threads.
+"""
+import bisect
+import threading
+import typing as t
+from collections import OrderedDict
+from time import perf_counter_ns
+
+from horseman.types import HTTPMethod
+from roughrider.routing.meta import Route, RouteEndpoint, AsyncRouteEndpoint
+
+
+# Upper bounds of the latency buckets, in nanoseconds.
+BUCKETS = (
+    50_000, 100_000, 250_000, 500_000,
+    1_000_000, 2_500_000, 5_000_000,
+    10_000_000, 25_000_000, 50_000_000,
+    100_000_000, 250_000_000, 500_000_000,
+    1_000_000_000,
+)
+
+# Requested paths whose generated endpoint is remembered, oldest out.
+GENERATED_SIZE = 1024
+
+
+class RouteStats(t.NamedTuple):
+    path: str
+    hits: int
+    not_allowed: int
+    duration: int  # Total of the endpoint calls durations, in nanoseconds.
+    histogram: t.Tuple[int, ...]
+    buckets: t.Tuple[int, ...]
+
+    @property
+    def calls(self) -> int:
+        return sum(self.histogram)
+
+    def quantile(self, q: float) -> t.Optional[float]:
+        """Returns the upper bound of the bucket holding the given
+        quantile of the calls durations, in nanoseconds. The last bucket
+        is unbounded.
+        """
+        total = self.calls
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for bound, count in zip(self.buckets, self.histogram):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+class Snapshot(t.NamedTuple):
+    not_found: int
+    not_allowed: int
+    routes: t.Dict[str, RouteStats]
+
+
+class Counters:
+    __slots__ = ('hits', 'not_allowed', 'not_found', 'durations', 'histograms')
+
+    def __init__(self):
+        self.hits = {}
+        self.not_allowed = {}
+        self.not_found = 0
+        self.durations = {}
+        self.histograms = {}
+
+
+class TimedEndpoint(RouteEndpoint):
+    """Route endpoint recording the duration of its calls against the
+    path of its route definition.
+    """
+
+    def __call__(self, *args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return self.endpoint(*args, **kwargs)
+        finally:
+            self.observe(self.path, perf_counter_ns() - start)
+
+
+class AsyncTimedEndpoint(AsyncRouteEndpoint):
+
+    async def __call__(self, *args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return await self.endpoint(*args, **kwargs)
+        finally:
+            self.observe(self.path, perf_counter_ns() - start)
+
+
+class Instrumentation:
+    """Records the hits, the 404 and 405 outcomes and the endpoints
+    calls latencies of a router, by route definition path.
+    """
+
+    def __init__(self, router, resolve: t.Callable, buckets=BUCKETS):
+        self.router = router
+        self.buckets = tuple(buckets)
+        self.resolve_route = resolve
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = []
+        # Keyed by endpoint id: the endpoint is kept along, for its id
+        # not to be reused. The endpoints generated by the router, such
+        # as the OPTIONS ones shared by the routes of a same methods
+        # set, are keyed by `(endpoint id, path)`.
+        self._timed = {}
+        # The timed generated endpoints, by `(endpoint id, path_info)`:
+        # their route definition path is not looked up on each call.
+        self._generated = OrderedDict()
+        self._paths = {}
+
+    def counters(self) -> Counters:
+        counters = getattr(self._local, 'counters', None)
+        if counters is None:
+            counters = self._local.counters = Counters()
+            with self._lock:
+                self._counters.append(counters)
+        return counters
+
+    def invalidate(self):
+        """Forgets the paths of the generated endpoints, on route
+        changes: the requested paths may match other routes.
+        """
+        with self._lock:
+            self._generated.clear()
+
+    def template(self, path_info: str,
+                 payload: t.Optional[dict] = None) -> str:
+        """Returns the path of the route definition matching `path_info`.
+        """
+        if payload is None:
+            payload, _ = self.router.match(path_info)
+            if payload is None:
+                return path_info
+        for indexed in (False, True):
+            if indexed:
+                # Routes were added since the last indexing.
+                self._paths = {
+                    id(endpoint): (endpoint, routedef.path)
+                    for routedef in self.router
+                    for endpoint in routedef.payload.values()
+                }
+            for endpoint in payload.values():
+                found = self._paths.get(id(endpoint))
+                if found is not None:
+                    return found[1]
+        return path_info
+
+    def timed(self, endpoint: RouteEndpoint, path_info: str) \
+            -> TimedEndpoint:
+        payload, _ = self.router.match(path_info)
+        path = self.template(path_info, payload)
+        if payload is not None and any(
+                routed is endpoint for routed in payload.values()):
+            key = id(endpoint)
+        else:
+            key = (id(endpoint), path)
+            found = self._timed.get(key)
+            if found is None:
+                found = self._timed[key] = (
+                    endpoint, self._timing(endpoint, path))
+            with self._lock:
+                self._generated[(id(endpoint), path_info)] = found
+                if len(self._generated) > GENERATED_SIZE:
+                    self._generated.popitem(last=False)
+            return found[1]
+        timed = self._timing(endpoint, path)
+        self._timed[key] = (endpoint, timed)
+        return timed
+
+    def _timing(self, endpoint: RouteEndpoint, path: str) -> TimedEndpoint:
+        factory = AsyncTimedEndpoint if endpoint.is_async else TimedEndpoint
+        timed = factory(*endpoint)
+        timed.path = path
+        timed.observe = self.observe
+        return timed
+
+    def resolve(self, path_info: str, method: HTTPMethod) \
+            -> t.Union[Route, str, None]:
+        route = self.resolve_route(path_info, method)
+        counters = getattr(self._local, 'counters', None) or self.counters()
+        if route is None:
+            counters.not_found += 1
+            return None
+        if route.__class__ is str:
+            path = self.template(path_info)
+            counters.not_allowed[path] = counters.not_allowed.get(path, 0) + 1
+            return route
+        found = self._timed.get(id(route.endpoint)) \
+            or self._generated.get((id(route.endpoint), path_info))
+        timed = found[1] if found is not None \
+            else self.timed(route.endpoint, path_info)
+        counters.hits[timed.path] = counters.hits.get(timed.path, 0) + 1
+        return Route(route.path, timed, route.params)
+
+    def observe(self, path: str, duration: int):
+        counters = getattr(self._local, 'counters', None) or self.counters()
+        histogram = counters.histograms.get(path)
+        if histogram is None:
+            histogram = counters.histograms[path] = \
+                [0] * (len(self.buckets) + 1)
+        histogram[bisect.bisect_left(self.buckets, duration)] += 1
+        counters.durations[path] = counters.durations.get(path, 0) + duration
+
+    def snapshot(self) -> Snapshot:
+        with self._lock:
+            threads = list(self._counters)
+        not_found = 0
+        hits = {}
+        not_allowed = {}
+        durations = {}
+        histograms = {}
+        for counters in threads:
+            # Copies are atomic: the owning thread can keep counting.
+            not_found += counters.not_found
+            for path, count in counters.hits.copy().items():
+                hits[path] = hits.get(path, 0) + count
+            for path, count in counters.not_allowed.copy().items():
+                not_allowed[path] = not_allowed.get(path, 0) + count
+            for path, duration in counters.durations.copy().items():
+                durations[path] = durations.get(path, 0) + duration
+            for path, histogram in counters.histograms.copy().items():
+                found = histograms.get(path)
+                histograms[path] = list(histogram) if found is None \
+                    else [a + b for a, b in zip(found, histogram)]
+
+        empty = (0,) * (len(self.buckets) + 1)
+        routes = {
+            path: RouteStats(
+                path=path,
+                hits=hits.get(path, 0),
+                not_allowed=not_allowed.get(path, 0),
+                duration=durations.get(path, 0),
+                histogram=tuple(histograms.get(path, empty)),
+                buckets=self.buckets,
+            ) for path in {**hits, **not_allowed}
+        }
+        return Snapshot(
+            not_found=not_found,
+            not_allowed=sum(not_allowed.values()),
+            routes=routes,
+        )
@@ -0,0 +1,100 @@
+"""Lazy registration of the views.
+
+The methods of a view are known at registration, without instantiating
+it: the payload holds lazy endpoints. The extractor only runs on the
+first call of one of these endpoints, once, then the payloads get the
+actual endpoints.
+"""
+import threading
+import typing as t
+
+from horseman.types import HTTPMethod
+from roughrider.routing.meta import Endpoint, HTTPMethods, RouteEndpoint
+from roughrider.routing.utils import route_endpoint
+
+
+class LazyView:
+    __slots__ = ('view', 'methods', 'extractor', 'metadata', 'payloads',
+                 'endpoints', 'routed', 'lock')
+
+    def __init__(self, view, methods: t.Optional[HTTPMethods], extractor,
+                 metadata: t.Optional[dict] = None):
+        self.view = view
+        self.methods = methods
+        self.extractor = extractor
+        self.metadata = metadata
+        # Payloads holding the lazy endpoints of the view.
+        self.payloads = []
+        self.endpoints = None
+        # Routed endpoints, composed with the chain of the metadata.
+        self.routed = None
+        self.lock = threading.Lock()
+
+    def payload(self, verbs: HTTPMethods) \
+            -> t.Dict[HTTPMethod, RouteEndpoint]:
+        return {
+            verb: RouteEndpoint(
+                endpoint=LazyEndpoint(self, verb),
+                method=verb,
+                metadata=self.metadata
+            ) for verb in verbs
+        }
+
+    def load(self) -> t.Dict[HTTPMethod, Endpoint]:
+        if self.endpoints is None:
+            with self.lock:
+                if self.endpoints is None:
+                    endpoints = {}
+                    for endpoint, verbs in self.extractor(
+                            self.view, self.methods):
+                        for verb in verbs:
+                            endpoints[verb] = endpoint
+                    self.routed = {
+                        verb: route_endpoint(verb, endpoint, self.metadata)
+                        for verb, endpoint in endpoints.items()
+                    }
+                    self.swap(self.routed)
+                    self.endpoints = endpoints
+        return self.endpoints
+
+    def swap(self, routed: t.Dict[HTTPMethod, RouteEndpoint]):
+        for payload in self.payloads:
+            for method, current in list(payload.items()):
+                lazy = current.endpoint
+                if lazy.__class__ is LazyEndpoint and lazy.view is self \
+                        and method in routed:
+                    payload[method] = routed[method]
+        self.payloads = []
+
+
+class LazyEndpoint:
+    """Endpoint loading its view on its first call.
+    """
+    __slots__ = ('view', 'method')
+
+    def __init__(self, view: LazyView, method: HTTPMethod):
+        self.view = view
+        self.method = method
+
+    def __repr__(self):
+        return f'<LazyEndpoint {self.method} {self.view.view!r}>'
+
+    @property
+    def route(self):
+        # The identity of the route in the responses cache, once loaded.
+        routed = self.view.routed
+        if routed is None or self.method not in routed:
+            return None
+        return getattr(routed[self.method].endpoint, 'route', None)
+
+    def resolve(self) -> Endpoint:
+        endpoint = self.view.load().get(self.method)
+        if endpoint is None:
+            raise LookupError(
+                f'{self.view.view!r} has no endpoint for {self.method}.')
+        return endpoint
+
+    def __call__(self, *args, **kwargs):
+        self.resolve()
+        return self.view.routed[self.method](*args, **kwargs)
+
@@ -0,0 +1,144 @@
+"""Hot reload of the routes.
+
+The live routes delegate to a published router. A new router is built
+aside, through `__add__`, `spawn` and `register` or a snapshot, then
+published with a single reference swap: the calls in flight finish on
+the previous router.
+
+    live = LiveRoutes(routes)
+    node = RoutingNode(live)
+    ...
+    changes = live.reload(snapshot.load(data))
+"""
+import threading
+import typing as t
+
+from horseman.types import HTTPMethod
+from roughrider.routing.chains import original
+from roughrider.routing.components import Routes
+from roughrider.routing.hosts import HostRoutes
+from roughrider.routing.lazy import LazyEndpoint
+from roughrider.routing.meta import RouteEndpoint
+from roughrider.routing.responses import RESPONSES
+
+
+class RoutesDiff(t.NamedTuple):
+    added: t.Tuple[str, ...]
+    removed: t.Tuple[str, ...]
+    changed: t.Tuple[str, ...]
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+def signature(endpoint: RouteEndpoint) -> t.Tuple:
+    # Endpoints compare as registered: the chains are composed anew and
+    # the views instantiated anew by each registration.
+    target = endpoint.endpoint
+    if target.__class__ is LazyEndpoint:
+        target = target.view.view
+    else:
+        target = original(target, endpoint.metadata, endpoint.method)
+    return (
+        getattr(target, '__func__', target),
+        endpoint.__class__,
+        endpoint.metadata
+    )
+
+
+def hosted(routes: Routes) -> t.Iterator[t.Tuple[str, Routes]]:
+    # The routes of the hosts are keyed as their URLs: `//host/path`.
+    yield '', routes
+    if isinstance(routes, HostRoutes):
+        for entry in (*routes._hosts.values(), *routes._patterns):
+            yield f'//{entry.pattern}', entry.routes
+
+
+def table(routes: Routes) -> t.Dict[str, t.Tuple]:
+    found = {}
+    for prefix, router in hosted(routes):
+        converters = {
+            path: converter.converters
+            for path, converter in router._flat_converters()
+        }
+        for routedef in router:
+            found[prefix + routedef.path] = (
+                {method: signature(endpoint)
+                 for method, endpoint in routedef.payload.items()},
+                converters.get(routedef.path)
+            )
+    return found
+
+
+def diff(old: Routes, new: Routes) -> RoutesDiff:
+    """Returns the paths added, removed and changed by the new routes.
+    """
+    before = table(old)
+    after = table(new)
+    return RoutesDiff(
+        added=tuple(path for path in after if path not in before),
+        removed=tuple(path for path in before if path not in after),
+        changed=tuple(
+            path for path, routed in after.items()
+            if path in before and before[path] != routed
+        )
+    )
+
+
+class LiveRoutes:
+    """Routes published by reference, reloadable while serving.
+    """
+    __slots__ = ('routes', 'lock')
+
+    def __init__(self, routes: Routes):
+        self.routes = routes
+        # Serializes the reloads, the matching never locks.
+        self.lock = threading.Lock()
+
+    def __iter__(self):
+        return iter(self.routes)
+
+    def match(self, *args, **kwargs):
+        return self.routes.match(*args, **kwargs)
+
+    def match_method(self, *args, **kwargs):
+        return self.routes.match_method(*args, **kwargs)
+
+    def dispatch(self, path_info: str, method: HTTPMethod, request):
+        return self.routes.dispatch(path_info, method, request)
+
+    def match_many(self, *args, **kwargs):
+        return self.routes.match_many(*args, **kwargs)
+
+    def url_for(self, name: str, /, **params) -> str:
+        return self.routes.url_for(name, **params)
+
+    def url_for_many(self, *args, **kwargs) -> t.List[str]:
+        return self.routes.url_for_many(*args, **kwargs)
+
+    def has_route(self, name: str) -> bool:
+        return self.routes.has_route(name)
+
+    def invalidate(self, name: str):
+        self.routes.invalidate(name)
+
+    def reload(self, routes: Routes) -> RoutesDiff:
+        """Publishes the routes, if they differ from the live ones, and
+        returns the differences. The cached responses of the routes
+        changed or removed are dropped, of these routes only.
+        """
+        if not isinstance(routes, Routes):
+            raise TypeError(f'Can only publish Routes: {routes!r}.')
+        with self.lock:
+            previous = self.routes
+            changes = diff(previous, routes)
+            if changes:
+                self.routes = routes
+        if changes.changed or changes.removed:
+            stale = set(changes.changed) | set(changes.removed)
+            for prefix, router in hosted(previous):
+                for routedef in router:
+                    if prefix + routedef.path in stale:
+                        RESPONSES.invalidate_endpoints(
+                            routedef.payload.values())
+        return changes
@@ -12,10 +12,19 @@ class RouteEndpoint(t.NamedTuple):
     endpoint: Endpoint
     metadata: t.Optional[t.Dict[t.Any, t.Any]] = None
 
+    # Whether calling the endpoint returns an awaitable.
+    is_async = False
+
     def __call__(self, *args, **kwargs):
         return self.endpoint(*args, **kwargs)
 
 
+class AsyncRouteEndpoint(RouteEndpoint):
+    __slots__ = ()
+
+    is_async = True
+
+
 class RouteDefinition(t.NamedTuple):
     path: str
     payload: t.Dict[HTTPMethod, RouteEndpoint]
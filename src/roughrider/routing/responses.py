@@ -0,0 +1,289 @@
+"""Responses cache of the routes, opted in through the metadata:
+
+    @router.register('/items/{id:int}', name='item', cache=60)
+    def item(request, id):
+        ...
+
+The responses of the GET and HEAD endpoints are cached for `cache`
+seconds, keyed on the route and on its params, in the order of the
+path: the endpoint is not called on hits. The routes are identified by
+their name, if any, the reference of their endpoint and the number of
+the registration of this endpoint: routers registering the same
+endpoint don't share their entries, and the processes registering their
+routes in the same order do. The guards of the route run before the
+lookup.
+
+Only the responses that can be served again are stored: the responses
+whose body is bytes or a string, and the bytes and strings returned as
+is; not the iterators, nor the responses setting cookies. The responses
+are stored as their status, body and headers: each hit gets a new
+response, that can be changed without affecting the next ones. A
+failure to store a response never fails the request.
+
+The responses are stored in the `RESPONSES` cache, in process memory
+by default. Its backend can be replaced by a store shared between the
+processes:
+
+    RESPONSES.backend = FileBackend('/var/cache/responses')
+"""
+import contextlib
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+from pathlib import Path
+
+from horseman.response import Response
+from roughrider.routing.meta import RouteEndpoint
+
+
+logger = logging.getLogger(__name__)
+
+# Methods whose responses are cached.
+CACHEABLE = frozenset(('GET', 'HEAD'))
+
+# Route identity: name, endpoint reference, method and registration.
+Identity = t.Tuple[t.Optional[str], str, str, int]
+Key = t.Tuple[Identity, t.Tuple[t.Tuple[str, t.Any], ...]]
+
+
+class Stored(t.NamedTuple):
+    """Response as stored, built anew on each hit.
+    """
+    status: int
+    body: t.Union[bytes, str, None]
+    headers: t.Tuple[t.Tuple[str, str], ...]
+
+    def response(self) -> Response:
+        return Response(self.status, self.body, list(self.headers))
+
+
+class MemoryBackend:
+    """Least recently used entries of the process, expiring.
+    """
+    __slots__ = ('maxsize', 'entries', 'routes', 'lock')
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        # Keys of the entries, by route identity.
+        self.routes = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key: Key) -> t.Any:
+        # Hits don't lock: the entry may only be gone meanwhile.
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            with self.lock:
+                if self.entries.get(key) is entry:
+                    self._discard(key)
+            return None
+        try:
+            self.entries.move_to_end(key)
+        except KeyError:
+            pass
+        return entry[1]
+
+    def set(self, key: Key, value: t.Any, ttl: float):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            self.routes.setdefault(key[0], set()).add(key)
+            while len(self.entries) > self.maxsize:
+                self._discard(next(iter(self.entries)))
+
+    def _discard(self, key: Key):
+        del self.entries[key]
+        keys = self.routes[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self.routes[key[0]]
+
+    def invalidate(self, route: Identity):
+        with self.lock:
+            for key in self.routes.pop(route, ()):
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.routes.clear()
+
+
+class FileBackend:
+    """Entries stored as pickles in a directory shared between the
+    processes, a subdirectory per route. The least recently used
+    entries are evicted beyond `maxsize`, the directory being scanned
+    once every `maxsize // 16` writes of the process: it can hold up
+    to that many more entries meanwhile. The unreadable entries are
+    logged and missed.
+    """
+    __slots__ = ('directory', 'maxsize', 'writes')
+
+    def __init__(self, directory: t.Union[str, Path],
+                 maxsize: t.Optional[int] = None):
+        self.directory = Path(directory)
+        self.maxsize = maxsize
+        self.writes = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def digest(value: t.Any) -> str:
+        return hashlib.sha1(repr(value).encode()).hexdigest()
+
+    def path(self, key: Key) -> Path:
+        return self.directory / self.digest(key[0]) / self.digest(key)
+
+    def get(self, key: Key) -> t.Any:
+        path = self.path(key)
+        try:
+            with path.open('rb') as stored:
+                expires, value = pickle.load(stored)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning('Unreadable cached response %s.', path,
+                           exc_info=True)
+            with contextlib.suppress(OSError):
+                path.unlink(missing_ok=True)
+            return None
+        if expires < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)
+        return value
+
+    def set(self, key: Key, value: t.Any, ttl: float):
+        path = self.path(key)
+        path.parent.mkdir(exist_ok=True)
+        # Written aside then moved: readers never see partial entries.
+        fd, temporary = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as stored:
+                pickle.dump((time.time() + ttl, value), stored)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        if self.maxsize is not None:
+            # Counted without locking: a lost count only delays a scan.
+            self.writes += 1
+            if self.writes >= max(1, self.maxsize // 16):
+                self.writes = 0
+                self.evict()
+
+    def evict(self):
+        entries = [
+            entry for entry in self.directory.glob('*/*') if entry.is_file()]
+        if len(entries) > self.maxsize:
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:len(entries) - self.maxsize]:
+                entry.unlink(missing_ok=True)
+
+    def invalidate(self, route: Identity):
+        directory = self.directory / self.digest(route)
+        for entry in directory.glob('*'):
+            entry.unlink(missing_ok=True)
+
+    def clear(self):
+        for entry in self.directory.glob('*/*'):
+            entry.unlink(missing_ok=True)
+
+
+class ResponseCache:
+    """Responses cache, on a backend implementing `get`, `set`,
+    `invalidate` and `clear`.
+    """
+    __slots__ = ('backend',)
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else MemoryBackend()
+
+    def get(self, key: Key) -> t.Any:
+        """Returns the cached response, a new one for the stored
+        responses, or None.
+        """
+        value = self.backend.get(key)
+        if value.__class__ is Stored:
+            return value.response()
+        return value
+
+    def set(self, key: Key, value: t.Any, ttl: float):
+        self.backend.set(key, value, ttl)
+
+    def store(self, key: Key, response: t.Any, ttl: float):
+        """Stores the response if it can be served again. The errors of
+        the backend are logged, not raised.
+        """
+        if not reusable(response):
+            return
+        if isinstance(response, Response):
+            response = Stored(
+                response.status.value, response.body,
+                tuple((str(name), value)
+                      for name, value in response.headers.items()))
+        try:
+            self.backend.set(key, response, ttl)
+        except Exception:
+            logger.exception('Failed to cache the response of %r.', key[0])
+
+    def invalidate(self, route: Identity):
+        """Drops the cached responses of the route.
+        """
+        self.backend.invalidate(route)
+
+    def invalidate_endpoints(self, endpoints: t.Iterable[RouteEndpoint]):
+        """Drops the cached responses of the route endpoints.
+        """
+        for endpoint in endpoints:
+            route = getattr(endpoint.endpoint, 'route', None)
+            if route is not None:
+                self.backend.invalidate(route)
+
+    def clear(self):
+        self.backend.clear()
+
+
+RESPONSES = ResponseCache()
+
+
+def reusable(response: t.Any) -> bool:
+    # The iterators are consumed by their first serving, as are the
+    # finishers of the responses. The cookies belong to a client.
+    if isinstance(response, Response):
+        headers = response.headers
+        return (response.body is None
+                or isinstance(response.body, (bytes, str))) \
+            and not response._finishers \
+            and not headers._cookies and 'Set-Cookie' not in headers
+    return isinstance(response, (bytes, str))
+
+
+# Registrations of the endpoints, by identity but the registration.
+REGISTRATIONS = {}
+REGISTRATIONS_LOCK = threading.Lock()
+
+
+def identity(endpoint, metadata: t.Mapping, method: str) -> Identity:
+    target = getattr(endpoint, '__func__', endpoint)
+    if not hasattr(target, '__qualname__'):
+        target = target.__class__
+    registered = (
+        metadata.get('name'),
+        f'{target.__module__}:{target.__qualname__}',
+        method
+    )
+    with REGISTRATIONS_LOCK:
+        count = REGISTRATIONS.get(registered, -1) + 1
+        REGISTRATIONS[registered] = count
+    return (*registered, count)
@@ -0,0 +1,166 @@
+"""Serialization of a built router.
+
+The snapshot is a JSON-compatible mapping: endpoints are stored as
+importable references and the metadata mappings are stored once, then
+referred to by index. Restoring a snapshot inserts the routes and the
+names index in one go, without any view introspection.
+"""
+import importlib
+import inspect
+import json
+import typing as t
+
+from roughrider.routing.chains import CHAINS, original
+from roughrider.routing.components import Routes, NamedRoutes
+from roughrider.routing.converters import CONVERTERS, RouteConverter
+from roughrider.routing.hosts import HostRoutes
+from roughrider.routing.lazy import LazyEndpoint
+from roughrider.routing.utils import route_endpoint
+
+
+FORMAT = 1
+
+
+def reference(obj: t.Any) -> str:
+    """Returns the `module:qualname` reference of an importable object.
+    Methods are referenced as `module:Class.method`: the class is
+    instantiated on restore.
+    """
+    if inspect.ismethod(obj):
+        target = obj.__func__
+        owner = obj.__self__
+        if inspect.isclass(owner):
+            raise ValueError(f'Class methods are not supported: {obj!r}.')
+        ref = f'{reference(owner.__class__)}.{target.__name__}'
+        if resolve(ref) is not target:
+            raise ValueError(f'{obj!r} is not reachable as {ref!r}.')
+        return ref
+
+    module = getattr(obj, '__module__', None)
+    qualname = getattr(obj, '__qualname__', None)
+    if not module or not qualname or '<' in qualname:
+        raise ValueError(f'{obj!r} is not importable.')
+    ref = f'{module}:{qualname}'
+    if resolve(ref) is not obj:
+        raise ValueError(f'{obj!r} is not reachable as {ref!r}.')
+    return ref
+
+
+def resolve(ref: str,
+            instances: t.Optional[t.Dict[type, t.Any]] = None) -> t.Any:
+    """Imports the object referenced by `ref`.
+    If an `instances` mapping is given, methods are bound to an instance
+    of their class, shared through the mapping.
+    """
+    module, _, qualname = ref.partition(':')
+    obj = importlib.import_module(module)
+    parent = None
+    for name in qualname.split('.'):
+        parent, obj = obj, getattr(obj, name)
+    if instances is not None and inspect.isclass(parent) \
+            and inspect.isfunction(obj):
+        instance = instances.get(parent)
+        if instance is None:
+            instance = instances[parent] = parent()
+        return getattr(instance, obj.__name__)
+    return obj
+
+
+def dump_metadata(metadata: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+    # The guards and middlewares are stored as references.
+    return {
+        key: [reference(item) for item in value] if key in CHAINS else value
+        for key, value in metadata.items()
+    }
+
+
+def load_metadata(metadata: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+    return {
+        key: [resolve(item) for item in value] if key in CHAINS else value
+        for key, value in metadata.items()
+    }
+
+
+def dump(router: Routes) -> t.Dict[str, t.Any]:
+    metadata = {}
+    routes = []
+    for routedef in router:
+        endpoints = []
+        for method, endpoint in routedef.payload.items():
+            if endpoint.metadata is None:
+                index = None
+            else:
+                index = metadata.setdefault(id(endpoint.metadata), (
+                    len(metadata), endpoint.metadata))[0]
+            target = endpoint.endpoint
+            if target.__class__ is LazyEndpoint:
+                target = target.resolve()
+            else:
+                target = original(target, endpoint.metadata, method)
+            endpoints.append([method, reference(target), index])
+        routes.append([routedef.path, endpoints])
+
+    converters = {
+        path: converter.names()
+        for path, converter in router._flat_converters()
+    }
+    settings = router.settings
+    settings['extractor'] = reference(settings['extractor'])
+    data = {
+        'format': FORMAT,
+        'router': reference(router.__class__),
+        'settings': settings,
+        'metadata': [dump_metadata(value) for _, value in metadata.values()],
+        'routes': routes,
+        'converters': converters,
+    }
+    if isinstance(router, NamedRoutes):
+        data['names'] = [list(item) for item in router._flat_names()]
+    if isinstance(router, HostRoutes):
+        # Exact hosts first, then the patterns in their matching order.
+        data['hosts'] = [
+            [entry.pattern, dump(entry.routes)]
+            for entry in (*router._hosts.values(), *router._patterns)
+        ]
+    return data
+
+
+def load(data: t.Mapping[str, t.Any]) -> Routes:
+    if data.get('format') != FORMAT:
+        raise ValueError(
+            f"Unsupported snapshot format: {data.get('format')!r}.")
+
+    factory = resolve(data['router'])
+    settings = dict(data['settings'])
+    settings['extractor'] = resolve(settings['extractor'])
+    router = factory(**settings)
+    router._converters = {
+        path: RouteConverter({
+            param: CONVERTERS[name] for param, name in names.items()
+        }) for path, names in data.get('converters', {}).items()
+    }
+    metadata = [load_metadata(value) for value in data['metadata']]
+    instances = {}
+    for path, endpoints in data['routes']:
+        router._insert(path, {
+            method: route_endpoint(
+                method, resolve(ref, instances),
+                metadata[index] if index is not None else None
+            ) for method, ref, index in endpoints
+        })
+    if isinstance(router, NamedRoutes):
+        router._names = {name: path for name, path in data['names']}
+        if not router.compact:
+            router._urls = {
+                name: router._builder(path) for name, path in data['names']}
+    for pattern, routes in data.get('hosts', ()):
+        router.host(pattern, load(routes))
+    return router
+
+
+def dumps(router: Routes, **kwargs) -> str:
+    return json.dumps(dump(router), **kwargs)
+
+
+def loads(serialized: t.Union[str, bytes]) -> Routes:
+    return load(json.loads(serialized))
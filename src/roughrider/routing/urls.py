@@ -0,0 +1,210 @@
+import functools
+import re
+import typing as t
+from urllib.parse import quote, urlencode
+
+import autoroutes
+
+
+# Placeholders as understood by autoroutes: `{name}` or `{name:type}`,
+# the type being a known match type or a regular expression.
+PLACEHOLDER = re.compile(r'{([^:}]+)(?::([^}]+))?}')
+
+# RFC 3986 unreserved characters: such values need no quoting.
+UNRESERVED = re.compile(r'[A-Za-z0-9_.~-]+').fullmatch
+
+# Characters allowed as is in a path segment, besides the unreserved.
+SEGMENT_SAFE = "!$&'()*+,;=:@"
+
+# Validation of the values, mirroring the autoroutes matching.
+VALIDATORS = {
+    'alnum': str.isalnum,
+    'alpha': str.isalpha,
+    'any': lambda value: True,
+    'digit': str.isdigit,
+    'path': bool,
+    'string': lambda value: bool(value) and '/' not in value,
+}
+
+# Cheap checks of the common case: a valid value that needs no quoting.
+FAST_CHECKS = {
+    'alnum': 'isalnum',
+    'alpha': 'isalpha',
+    'any': 'isalnum',
+    'digit': 'isdigit',
+    'path': 'isalnum',
+    'string': 'isalnum',
+}
+
+# Match types that can span several path segments.
+MULTI_SEGMENTS = frozenset(('path', 'any'))
+
+
+class Placeholder(t.NamedTuple):
+    name: str
+    match_type: str
+    validate: t.Callable[[str], t.Any]
+    safe: str
+
+    def encode(self, value: str) -> str:
+        if not self.validate(value):
+            raise ValueError(
+                f'Param {self.name!r} does not match '
+                f'{self.match_type!r}: {value!r}.')
+        if UNRESERVED(value) is None:
+            return quote(value, safe=self.safe)
+        return value
+
+
+def placeholder(name: str, match_type: t.Optional[str]) -> Placeholder:
+    if match_type is None:
+        match_type = autoroutes.DEFAULT_MATCH_TYPE
+    validate = VALIDATORS.get(match_type)
+    if validate is None:
+        validate = re.compile(match_type).fullmatch
+    safe = SEGMENT_SAFE + '/' if match_type in MULTI_SEGMENTS \
+        else SEGMENT_SAFE
+    return Placeholder(name, match_type, validate, safe)
+
+
+def parse(path: str) -> t.List[t.Union[str, Placeholder]]:
+    segments = []
+    position = 0
+    for found in PLACEHOLDER.finditer(path):
+        if found.start() > position:
+            segments.append(path[position:found.start()])
+        segments.append(placeholder(*found.groups()))
+        position = found.end()
+    if position < len(path):
+        segments.append(path[position:])
+    return segments
+
+
+def with_query(url: str, params: t.Mapping[str, t.Any],
+               names: t.FrozenSet[str]) -> str:
+    query = {
+        key: value for key, value in params.items() if key not in names
+    }
+    return f'{url}?{urlencode(query, doseq=True)}'
+
+
+def encoding_lines(segments: t.Sequence[t.Union[str, Placeholder]],
+                   indent: str, serialized: t.Container[str] = ()) \
+        -> t.Tuple[t.List[str], str]:
+    """Source lines encoding the placeholders values, which are expected
+    as `v0`, `v1`... after the segments indexes, and the f-string
+    rendering the URL path. The `serialized` placeholders values go
+    through their `t0`, `t1`... serializers first.
+    """
+    lines = []
+    parts = []
+    for i, segment in enumerate(segments):
+        if segment.__class__ is str:
+            parts.append(f'{{s{i}}}')
+            continue
+        value = f'v{i}'
+        if segment.name in serialized:
+            lines.append(f'{indent}{value} = t{i}({value})')
+        lines.append(f'{indent}if {value}.__class__ is not str:')
+        lines.append(f'{indent}    {value} = str({value})')
+        check = FAST_CHECKS.get(segment.match_type)
+        if check is None:
+            lines.append(f'{indent}{value} = p{i}.encode({value})')
+        else:
+            lines.append(
+                f'{indent}if not ({value}.isascii() and {value}.{check}()):')
+            lines.append(f'{indent}    {value} = p{i}.encode({value})')
+        parts.append(f'{{{value}}}')
+    return lines, f"f'{''.join(parts)}'"
+
+
+@functools.lru_cache(maxsize=512)
+def compile_source(source: str):
+    # Routes of a same shape generate the same source: their literal
+    # parts only differ through the namespace.
+    return compile(source, '<url builder>', 'exec')
+
+
+def compile_builders(segments: t.Sequence[t.Union[str, Placeholder]],
+                     names: t.FrozenSet[str],
+                     serializers: t.Optional[
+                         t.Mapping[str, t.Callable[[t.Any], str]]] = None) \
+        -> t.Tuple[
+                         t.Callable[[t.Mapping[str, t.Any]], str],
+                         t.Callable[[t.Mapping[str, t.Sequence]],
+                                    t.List[str]]]:
+    """Generates functions dedicated to the given segments: one building
+    a URL out of a mapping of params, one building a list of URLs out
+    of a mapping of params columns. The values of the placeholders
+    having a serializer are serialized before being encoded.
+    The literal parts and the placeholders are handed over through the
+    namespace: only identifiers and reprs are written in the source.
+    """
+    serializers = serializers or {}
+    namespace = {'with_query': with_query, 'names': names}
+    variables = {}
+    for i, segment in enumerate(segments):
+        if segment.__class__ is str:
+            namespace[f's{i}'] = segment
+        else:
+            namespace[f'p{i}'] = segment
+            variables[f'v{i}'] = segment.name
+            if segment.name in serializers:
+                namespace[f't{i}'] = serializers[segment.name]
+
+    lines = ['def build(params):']
+    lines.extend(
+        f'    {value} = params[{name!r}]'
+        for value, name in variables.items())
+    encoding, url = encoding_lines(segments, '    ', serializers)
+    lines.extend(encoding)
+    lines.append(f'    url = {url}')
+    lines.append(f'    if len(params) > {len(names)}:')
+    lines.append('        return with_query(url, params, names)')
+    lines.append('    return url')
+
+    lines.append('def build_columns(columns):')
+    lines.append('    urls = []')
+    lines.append('    append = urls.append')
+    if variables:
+        lines.append(
+            f"    for {', '.join(variables)}, in zip("
+            f"{', '.join(f'columns[{name!r}]' for name in variables.values())}"
+            "):")
+        encoding, url = encoding_lines(segments, '        ', serializers)
+        lines.extend(encoding)
+        lines.append(f'        append({url})')
+    lines.append('    return urls')
+    exec(compile_source('\n'.join(lines)), namespace)
+    return namespace['build'], namespace['build_columns']
+
+
+class URLBuilder:
+    """Compiled reverse routing of a route path.
+
+    The path is parsed once, into dedicated functions that validate
+    the values against the placeholders types and quote them when
+    needed. `build` renders the params that are not placeholders of the
+    path as the query string. `build_columns` renders one URL per row
+    of the placeholders columns. Serializers turn the values of their
+    placeholder into strings.
+    """
+    __slots__ = ('path', 'segments', 'names', 'build', 'build_columns')
+
+    def __init__(self, path: str,
+                 serializers: t.Optional[
+                     t.Mapping[str, t.Callable[[t.Any], str]]] = None):
+        self.path = path
+        self.segments = tuple(parse(path))
+        self.names = frozenset(
+            segment.name for segment in self.segments
+            if segment.__class__ is Placeholder
+        )
+        self.build, self.build_columns = compile_builders(
+            self.segments, self.names, serializers)
+
+    def __repr__(self):
+        return f'<URLBuilder {self.path!r}>'
+
+    def __call__(self, params: t.Mapping[str, t.Any]) -> str:
+        return self.build(params)
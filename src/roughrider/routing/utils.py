@@ -1,13 +1,36 @@
 import inspect
 import typing as t
+from weakref import WeakKeyDictionary
 from horseman.types import HTTPMethod
 from horseman.meta import APIView
 from horseman.http import HTTPError
-from roughrider.routing.meta import Endpoint, HTTPMethods
+from roughrider.routing.chains import compose
+from roughrider.routing.meta import (
+    Endpoint, HTTPMethods, RouteEndpoint, AsyncRouteEndpoint)
 
 
 METHODS = frozenset(t.get_args(HTTPMethod))
 
+# Routed methods of the APIView classes.
+VIEW_METHODS = WeakKeyDictionary()
+
+
+def view_methods(cls: type) -> t.Tuple[HTTPMethod, ...]:
+    """Returns the HTTP methods implemented by an APIView class, as
+    the names of the attributes that bind as methods on its instances.
+    The result is cached per class.
+    """
+    methods = VIEW_METHODS.get(cls)
+    if methods is None:
+        methods = VIEW_METHODS[cls] = tuple(
+            name for name in sorted(METHODS)
+            if inspect.ismethod(getattr(cls, name, None)) or (
+                inspect.isfunction(getattr(cls, name, None))
+                and not isinstance(
+                    inspect.getattr_static(cls, name), staticmethod))
+        )
+    return methods
+
 
 def get_routables(view, methods: t.Optional[HTTPMethods] = None) \
       -> t.Iterator[t.Tuple[Endpoint, HTTPMethods]]:
@@ -16,11 +39,8 @@ def get_routables(view, methods: t.Optional[HTTPMethods] = None) \
         if methods is not None:
             raise AttributeError(
                 'Registration of APIView does not accept methods.')
-        members = inspect.getmembers(
-            inst, predicate=(lambda x: inspect.ismethod(x)
-                             and x.__name__ in METHODS))
-        for name, func in members:
-            yield func, [name]
+        for name in view_methods(inst.__class__):
+            yield getattr(inst, name), [name]
 
     if inspect.isclass(view):
         inst = view()
@@ -47,3 +67,62 @@ def get_routables(view, methods: t.Optional[HTTPMethods] = None) \
         yield view, methods
     else:
         raise ValueError(f'Unknown type of route: {view}.')
+
+
+def routable_methods(view, methods: t.Optional[HTTPMethods] = None) \
+      -> HTTPMethods:
+    """Returns the methods `get_routables` would route the view on,
+    without instantiating it.
+    """
+    if isinstance(view, APIView) or (
+            inspect.isclass(view) and issubclass(view, APIView)):
+        if methods is not None:
+            raise AttributeError(
+                'Registration of APIView does not accept methods.')
+        return list(view_methods(view if inspect.isclass(view)
+                                 else view.__class__))
+    if not inspect.isclass(view) and not inspect.isfunction(view):
+        raise ValueError(f'Unknown type of route: {view}.')
+    if methods is None:
+        return ['GET']
+    unknown = set(methods) - METHODS
+    if unknown:
+        raise ValueError(
+            f"Unknown HTTP method(s): {', '.join(unknown)}")
+    return list(methods)
+
+
+# The lazy registration reads the methods through the `methods`
+# attribute of the extractor, without instantiating the view.
+get_routables.methods = routable_methods
+
+
+def extracted_methods(extractor, view,
+                      methods: t.Optional[HTTPMethods] = None) \
+        -> HTTPMethods:
+    """Returns the methods the extractor would route the view on, as
+    reported by its `methods` attribute.
+    """
+    report = getattr(extractor, 'methods', None)
+    if report is None:
+        raise TypeError(
+            f"Extractor {extractor!r} doesn't report its methods.")
+    return report(view, methods)
+
+
+def is_coroutine(endpoint: Endpoint) -> bool:
+    """Whether the endpoint is a coroutine function, or an instance
+    with a coroutine `__call__`.
+    """
+    return inspect.iscoroutinefunction(endpoint) or \
+        inspect.iscoroutinefunction(getattr(endpoint, '__call__', None))
+
+
+def route_endpoint(method: HTTPMethod, endpoint: Endpoint,
+                   metadata: t.Optional[dict] = None) -> RouteEndpoint:
+    # The chain declared in the metadata is composed here.
+    if is_coroutine(endpoint):
+        return AsyncRouteEndpoint(
+            method, compose(endpoint, metadata, method, True), metadata)
+    return RouteEndpoint(
+        method, compose(endpoint, metadata, method), metadata)
@@ -0,0 +1,38 @@
+"""WSGI node rendering the HTTP errors with their headers.
+
+horseman's `Node` renders the HTTP errors raised by `resolve` without
+their headers: the `MethodNotAllowed` errors lose their `Allow` header.
+The node below renders them, as the ASGI node does:
+
+    class Application(RoutingNode):
+
+        def resolve(self, path_info, environ):
+            return self.routes.dispatch(
+                path_info, environ['REQUEST_METHOD'], Request(environ))
+"""
+from horseman.http import HTTPError
+from horseman.meta import Node, slashes_normalization
+from horseman.response import Response
+from horseman.types import Environ, StartResponse
+
+
+class RoutingNode(Node):
+
+    def __call__(self, environ: Environ, start_response: StartResponse):
+        path_info = environ.get(
+            'PATH_INFO', '').encode('latin-1').decode('utf-8')
+        if path_info:
+            path_info = slashes_normalization.sub('/', path_info)
+        try:
+            response = self.resolve(path_info, environ)
+            if response is None:
+                response = Response(404)
+        except HTTPError as error:
+            response = Response(error.status, error.body)
+            # Headers names as `str`, not as the `istr` of horseman.
+            headers = getattr(error, 'headers', None) or {}
+            start_response(
+                f'{response.status.value} {response.status.phrase}',
+                [(str(name), value) for name, value in headers.items()])
+            return response
+        return response(environ, start_response)
@@ -0,0 +1,87 @@
+from roughrider.routing.analysis import analyze, Issue
+from roughrider.routing.components import Routes
+
+
+def view(request, **params):
+    pass
+
+
+def other(request, **params):
+    pass
+
+
+def kinds(issues):
+    return sorted((issue.kind, issue.path, issue.other) for issue in issues)
+
+
+def test_conflicts():
+    router = Routes()
+    router.register('/item/new')(view)
+    router.register('/item/new', methods=['GET', 'POST'])(other)
+    router.register('/b/{id}')(view)
+    router.register('/b/{name}')(other)
+    router.register('/{v:[0-9]+}/long/path')(view)
+    router.register('/{v:[0-9]+}')(view)
+    api = Routes()
+    api.register('/x')(view)
+    api.register('/x')(other)
+    router.mount('/api', api)
+
+    issues = [issue for issue in analyze(router)
+              if issue.kind in ('duplicate', 'lost')]
+    assert issues == [
+        Issue('duplicate', '/item/new', 'GET registered again'),
+        Issue('duplicate', '/b/{name}', 'GET registered again'),
+        Issue('lost', '/{v:[0-9]+}', 'dropped by the trie'),
+        Issue('duplicate', '/api/x', 'GET registered again'),
+    ]
+
+
+def test_identical_endpoints():
+    router = Routes()
+    router.register('/x')(view)
+    router.register('/y/{id}', methods=['GET', 'POST'])(view)
+    sub = Routes()
+    sub.register('/z')(other)
+    router += router
+    router.merge(sub, sub)
+    assert router._conflicts == []
+    assert not [issue for issue in analyze(router)
+                if issue.kind == 'duplicate']
+
+
+def test_overlaps():
+    router = Routes()
+    for path in ('/item/{id}', '/item/new', '/a/{id:digit}',
+                 '/a/{name:alpha}', '/x/{id:digit}/y', '/x/{name}/z',
+                 '/files/{path:path}', '/files/{name}/raw'):
+        router.register(path)(view)
+
+    assert kinds(analyze(router)) == [
+        ('ambiguous', '/files/{name}/raw', '/files/{path:path}'),
+        ('ambiguous', '/item/new', '/item/{id}'),
+        ('shadowed', '/files/{name}/raw', '/files/{path:path}'),
+    ]
+    # Frozen routes are analyzed alike.
+    assert kinds(analyze(router.freeze())) == kinds(analyze(router))
+
+
+def test_unreachable():
+    # The trie doesn't backtrack: the string placeholder is followed.
+    router = Routes()
+    router.register('/items/{id}/comments')(view)
+    router.register('/items/{id:digit}/comments/{cid:digit}')(view)
+    issue, = analyze(router)
+    assert issue == Issue(
+        'shadowed', '/items/{id:digit}/comments/{cid:digit}',
+        '/items/0/comments/0 is not served')
+
+
+def test_structure():
+    router = Routes()
+    for name in ('a', 'b', 'c'):
+        router.register(f'/{name}/{{id}}/deep')(view)
+    issues = analyze(router, max_depth=1, max_width=2)
+    assert ('wide', '/', None) in kinds(issues)
+    assert ('deep', '/a/{id}/deep', None) in kinds(issues)
+    assert analyze(router) == []
@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+import webtest
+from horseman.meta import APIView
+from horseman.response import Response
+from roughrider.routing.asgi import ASGINode
+from roughrider.routing.components import NamedRoutes
+from roughrider.routing.meta import AsyncRouteEndpoint
+from tests.conftest import MockRoutingNode
+
+
+def request(app, method, path, body=b''):
+    scope = {'type': 'http', 'method': method, 'path': path}
+    messages = [{'type': 'http.request', 'body': body}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start, *chunks = sent
+    return (
+        start['status'],
+        dict(start['headers']),
+        b''.join(chunk['body'] for chunk in chunks),
+    )
+
+
+def make_router(**kwargs):
+    router = NamedRoutes(**kwargs)
+
+    @router.register('/sync/{id}', name='sync')
+    def sync(request, id):
+        return Response(200, f'sync {id}')
+
+    @router.register('/async/{id}', methods=['GET', 'PUT'], name='async')
+    async def coroutine(request, id):
+        await asyncio.sleep(0)
+        return Response(200, f'async {id}')
+
+    @router.register('/echo')
+    class Echo(APIView):
+
+        async def POST(self, request):
+            return Response(201, await request.body())
+
+    return router
+
+
+def test_async_endpoints_detection():
+    router = make_router()
+    route = router.match_method('/async/1', 'GET')
+    assert route.endpoint.is_async
+    assert isinstance(route.endpoint, AsyncRouteEndpoint)
+    assert not router.match_method('/sync/1', 'GET').endpoint.is_async
+    assert router.match_method('/echo', 'POST').endpoint.is_async
+
+
+@pytest.mark.parametrize('threaded', [True, False])
+def test_asgi_node(threaded):
+    app = ASGINode(make_router(), threaded=threaded)
+    assert request(app, 'GET', '/sync/1') == (200, {}, b'sync 1')
+    assert request(app, 'GET', '//async/2') == (200, {}, b'async 2')
+    assert request(app, 'POST', '/echo', b'data') == (201, {}, b'data')
+
+    status, headers, body = request(app, 'GET', '/nothing')
+    assert status == 404
+    assert body == b'Nothing matches the given URI'
+
+    status, headers, body = request(app, 'POST', '/async/2')
+    assert status == 405
+    assert headers == {b'allow': b'GET, PUT'}
+
+
+def test_shared_routes():
+    router = make_router(lazy=True)
+    app = ASGINode(router)
+    assert request(app, 'GET', '/async/3') == (200, {}, b'async 3')
+    assert router.url_for('async', id=3) == '/async/3'
+
+    node = MockRoutingNode()
+    node.routes = router
+    response = webtest.TestApp(node).get('/sync/4')
+    assert response.body == b'sync 4'
+
+
+def test_lifespan():
+    app = ASGINode(make_router())
+    messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message['type'])
+
+    asyncio.run(app({'type': 'lifespan'}, receive, send))
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+
+
+def test_instrumented_async_endpoint():
+    router = make_router()
+    instruments = router.instrument()
+    app = ASGINode(router)
+    assert request(app, 'GET', '/async/1') == (200, {}, b'async 1')
+    stats = instruments.snapshot().routes['/async/{id}']
+    assert stats.hits == 1
+    assert stats.calls == 1
@@ -0,0 +1,127 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from horseman.meta import APIView
+from roughrider.routing.analysis import Issue, analyze
+from roughrider.routing.builder import RoutesBuilder, Registration
+from roughrider.routing.components import NamedRoutes, Routes
+
+
+def endpoint(request, **params):
+    return params
+
+
+class View(APIView):
+
+    def GET(self, request, **params):
+        return 'get'
+
+    def POST(self, request, **params):
+        return 'post'
+
+
+def registrations():
+    return [
+        Registration('/', endpoint, metadata={'name': 'index'}),
+        Registration('/items/{id:int}', View, metadata={'name': 'item'}),
+        Registration('/items/{id:int}', endpoint, ['DELETE']),
+        Registration('/files/{path:path}', endpoint),
+    ]
+
+
+@pytest.mark.parametrize('freeze', [False, True])
+@pytest.mark.parametrize('threaded', [False, True])
+def test_build(freeze, threaded):
+    builder = RoutesBuilder(NamedRoutes())
+    builder.extend(registrations())
+    builder.register('/about', name='about')(endpoint)
+    if threaded:
+        with ThreadPoolExecutor(2) as executor:
+            routes = builder.build(executor, freeze=freeze)
+    else:
+        routes = builder.build(freeze=freeze)
+
+    assert routes.dispatch('/items/1', 'GET', None) == 'get'
+    assert routes.dispatch('/items/1', 'DELETE', None) == {'id': 1}
+    assert routes.match_method('/items/a', 'GET') is None
+    assert routes.dispatch('/files/a/b', 'GET', None) == {'path': 'a/b'}
+    assert routes.url_for('item', id=2) == '/items/2'
+    assert routes.url_for('about') == '/about'
+    assert routes.match_method('/items/1', 'POST').endpoint.metadata == {
+        'name': 'item'}
+    assert builder.timings.total > 0
+    assert (routes._table is not None) is freeze
+    assert (routes is builder.routes) is not freeze
+
+
+def test_build_like_register():
+    registered = NamedRoutes()
+    for path, view, methods, converters, metadata in registrations():
+        registered.register(path, methods, converters, **metadata or {})(
+            view)
+    builder = RoutesBuilder(NamedRoutes())
+    builder.extend(registrations())
+    built = builder.build()
+    assert [routedef.path for routedef in built] == [
+        routedef.path for routedef in registered]
+    assert built._names == registered._names
+    assert built._converters.keys() == registered._converters.keys()
+
+
+def test_build_existing_routes():
+    routes = NamedRoutes()
+    routes.register('/home', name='home')(endpoint)
+    builder = RoutesBuilder(routes)
+    builder.register('/other', name='other')(endpoint)
+    frozen = builder.build(freeze=True)
+    assert frozen.url_for('home') == '/home'
+    assert frozen.match_method('/other', 'GET') is not None
+    assert routes.match_method('/other', 'GET') is None
+
+    assert builder.build() is routes
+    assert routes.url_for('other') == '/other'
+
+
+def test_build_conflicts():
+    routes = NamedRoutes()
+    routes.register('/home', name='home')(endpoint)
+    builder = RoutesBuilder(routes)
+    builder.register('/first')(endpoint)
+    builder.register('/second', name='home')(endpoint)
+    with pytest.raises(NameError) as exc:
+        builder.build()
+    assert str(exc.value) == "Route 'home' already exists for path '/home'."
+    # Nothing was added.
+    assert routes.match_method('/first', 'GET') is None
+
+    builder = RoutesBuilder(Routes())
+    builder.register('/', methods=['FETCH'])(endpoint)
+    with pytest.raises(ValueError):
+        builder.build()
+
+    with pytest.raises(TypeError):
+        RoutesBuilder(Routes().freeze())
+
+
+def test_build_lazy():
+    builder = RoutesBuilder(Routes(lazy=True))
+    builder.register('/items/{id}')(View)
+    routes = builder.build()
+    assert routes.dispatch('/items/1', 'POST', None) == 'post'
+    # The payload now holds the actual endpoints.
+    assert routes.match_method('/items/1', 'GET').endpoint.endpoint \
+        .__self__.__class__ is View
+
+
+def test_build_duplicates():
+    def other(request):
+        pass
+
+    for freeze in (False, True):
+        builder = RoutesBuilder(Routes())
+        builder.register('/item', methods=['GET', 'POST'])(endpoint)
+        builder.register('/item')(other)
+        built = builder.build(freeze=freeze)
+        assert built.match_method('/item', 'GET').endpoint.endpoint is other
+        assert [
+            issue for issue in analyze(built) if issue.kind == 'duplicate'
+        ] == [Issue('duplicate', '/item', 'GET registered again')]
@@ -0,0 +1,73 @@
+import http
+import pytest
+import horseman.http
+from roughrider.routing.components import Routes
+
+
+def test_cache_disabled_by_default():
+    router = Routes()
+    assert router.cache_info() is None
+
+
+def test_cache_hits_and_misses():
+    router = Routes(cache_size=10)
+
+    @router.register('/item/{id}')
+    def item(request, id):
+        pass
+
+    route = router.match_method('/item/1', 'GET')
+    assert route.params == {'id': '1'}
+    assert router.match_method('/item/1', 'GET') == route
+
+    info = router.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.maxsize == 10
+
+
+def test_cache_params_not_shared():
+    router = Routes(cache_size=10)
+
+    @router.register('/item/{id}')
+    def item(request, id):
+        pass
+
+    route = router.match_method('/item/1', 'GET')
+    route.params['id'] = 'changed'
+    route.params['extra'] = True
+    assert router.match_method('/item/1', 'GET').params == {'id': '1'}
+    assert router.match_method('/item/1', 'GET').params == {'id': '1'}
+    assert router.cache_info().hits == 2
+
+
+def test_cache_failures():
+    router = Routes(cache_size=10)
+
+    @router.register('/item')
+    def item(request):
+        pass
+
+    assert router.match_method('/nothing', 'GET') is None
+    assert router.match_method('/nothing', 'GET') is None
+
+    for _ in range(2):
+        with pytest.raises(horseman.http.HTTPError) as exc:
+            router.match_method('/item', 'POST')
+        assert exc.value.status == http.HTTPStatus(405)
+
+    info = router.cache_info()
+    assert info.hits == 2
+    assert info.misses == 2
+
+
+def test_cache_invalidation():
+    router = Routes(cache_size=10)
+    assert router.match_method('/item', 'GET') is None
+
+    @router.register('/item')
+    def item(request):
+        pass
+
+    assert router.cache_info().currsize == 0
+    assert router.match_method('/item', 'GET').endpoint.endpoint is item
@@ -0,0 +1,119 @@
+import asyncio
+import pytest
+from horseman.http import HTTPError
+from roughrider.routing.components import Routes
+from roughrider.routing import snapshot
+
+
+def authenticated(request, **params):
+    if not request.get('user'):
+        raise HTTPError(401)
+
+
+def owner(request, **params):
+    if params.get('id') != request.get('user'):
+        raise HTTPError(403)
+
+
+def tagged(endpoint):
+    def wrapper(request, **params):
+        return ('tagged', endpoint(request, **params))
+    return wrapper
+
+
+def view(request, **params):
+    return params
+
+
+def test_guards():
+    router = Routes()
+    router.register(
+        '/users/{id}', methods=['GET', 'PUT'],
+        guards=[authenticated, owner])(view)
+
+    route = router.match_method('/users/ann', 'GET')
+    assert route.endpoint(
+        {'user': 'ann'}, **route.params) == {'id': 'ann'}
+    with pytest.raises(HTTPError) as exc:
+        route.endpoint({}, **route.params)
+    assert exc.value.status == 401
+    with pytest.raises(HTTPError) as exc:
+        router.dispatch('/users/ann', 'PUT', {'user': 'bob'})
+    assert exc.value.status == 403
+
+    # The metadata is kept, the chain is composed once.
+    assert route.endpoint.metadata['guards'] == [authenticated, owner]
+    assert route.endpoint.endpoint.__wrapped__ is view
+    assert router.match_method('/users/bob', 'PUT').endpoint.endpoint \
+        is not view
+
+
+def test_middlewares():
+    calls = []
+
+    def trace(endpoint):
+        def wrapper(request, **params):
+            calls.append(request)
+            return endpoint(request, **params)
+        return wrapper
+
+    router = Routes()
+    router.register(
+        '/', guards=[authenticated], middlewares=[tagged, trace])(view)
+    assert router.dispatch('/', 'GET', {'user': 'ann'}) == ('tagged', {})
+    assert len(calls) == 1
+
+    # The guards run first.
+    with pytest.raises(HTTPError):
+        router.dispatch('/', 'GET', {})
+    assert len(calls) == 1
+
+    # No chain, no wrapping.
+    router.register('/plain', guards=[])(view)
+    assert router.match_method('/plain', 'GET').endpoint.endpoint is view
+
+
+def test_async_guards():
+
+    async def checked(request, **params):
+        if not request:
+            raise HTTPError(401)
+
+    async def endpoint(request, **params):
+        return 'ok'
+
+    router = Routes()
+    router.register('/', guards=[checked, authenticated])(endpoint)
+    route = router.match_method('/', 'GET')
+    assert route.endpoint.is_async
+    assert asyncio.run(route.endpoint({'user': 'ann'})) == 'ok'
+    with pytest.raises(HTTPError):
+        asyncio.run(route.endpoint({}))
+
+    with pytest.raises(TypeError):
+        router.register('/sync', guards=[checked])(view)
+    with pytest.raises(TypeError):
+        router.register('/invalid', guards=['admin'])(view)
+
+
+def test_lazy_guards():
+    router = Routes(lazy=True)
+    router.register('/', guards=[authenticated])(view)
+    route = router.match_method('/', 'GET')
+    with pytest.raises(HTTPError):
+        route.endpoint({})
+    assert router.match_method('/', 'GET').endpoint.endpoint.__wrapped__ \
+        is view
+
+
+def test_snapshot_chains():
+    router = Routes()
+    router.register('/{id}', guards=[owner], middlewares=[tagged])(view)
+    restored = snapshot.loads(snapshot.dumps(router))
+    route = restored.match_method('/ann', 'GET')
+    assert route.endpoint.metadata == {
+        'guards': [owner], 'middlewares': [tagged]}
+    assert restored.dispatch('/ann', 'GET', {'user': 'ann'}) == (
+        'tagged', {'id': 'ann'})
+    with pytest.raises(HTTPError):
+        restored.dispatch('/ann', 'GET', {'user': 'bob'})
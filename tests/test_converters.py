@@ -0,0 +1,104 @@
+import datetime
+import uuid
+import pytest
+from roughrider.routing.components import Routes, NamedRoutes
+from roughrider.routing.converters import Converter, route_converter
+from roughrider.routing import snapshot
+
+
+def endpoint(request, **params):
+    return params
+
+
+def test_route_converter():
+    path, converter = route_converter('/items/{id:int}/{slug}')
+    assert path == '/items/{id:digit}/{slug}'
+    assert converter.convert({'id': '12', 'slug': 'a'}) == {
+        'id': 12, 'slug': 'a'}
+
+    path, converter = route_converter(
+        '/items/{id:alnum}/{when}', {'id': int, 'when': 'date'})
+    assert path == '/items/{id:alnum}/{when:[0-9]+-[0-9]+-[0-9]+}'
+    assert sorted(converter.converters) == ['id', 'when']
+
+    assert route_converter('/items/{id}') == ('/items/{id}', None)
+
+    with pytest.raises(ValueError):
+        route_converter('/items/{id}', {'other': int})
+    with pytest.raises(ValueError):
+        route_converter('/items/{id}', {'id': 'unknown'})
+    with pytest.raises(TypeError):
+        route_converter('/items/{id}', {'id': 12})
+
+
+def test_converted_params():
+    router = NamedRoutes(cache_size=10)
+    router.register('/items/{id:int}', name='item')(endpoint)
+    router.register(
+        '/objects/{oid}', converters={'oid': 'uuid'}, name='object')(
+            endpoint)
+    router.register('/days/{day:date}', name='day')(endpoint)
+
+    assert router.match_method('/items/12', 'GET').params == {'id': 12}
+    oid = uuid.uuid4()
+    assert router.match_method(f'/objects/{oid}', 'GET').params == {
+        'oid': oid}
+    assert router.match_method('/days/2021-10-09', 'GET').params == {
+        'day': datetime.date(2021, 10, 9)}
+
+    # Values failing the conversion are not found.
+    assert router.match_method('/objects/abc', 'GET') is None
+    assert router.match_method('/days/2021-13-45', 'GET') is None
+    assert list(router.match_many([
+        ('/items/1', 'GET'), ('/days/2021-13-45', 'GET')])) == [
+            router.match_method('/items/1', 'GET'), 404]
+
+    # Raw strings are left to `match`.
+    assert router.match('/items/12')[1] == {'id': '12'}
+
+    assert router.url_for('item', id=12) == '/items/12'
+    assert router.url_for('object', oid=oid) == f'/objects/{oid}'
+    assert router.url_for(
+        'day', day=datetime.date(2021, 10, 9)) == '/days/2021-10-09'
+    assert router.url_for_many('item', id=[1, 2]) == ['/items/1', '/items/2']
+
+
+def test_custom_converter():
+    router = NamedRoutes()
+    flag = Converter('yes|no', lambda value: value == 'yes',
+                     lambda value: 'yes' if value else 'no')
+    router.register('/flags/{on}', converters={'on': flag}, name='flag')(
+        endpoint)
+    assert router.match_method('/flags/yes', 'GET').params == {'on': True}
+    assert router.url_for('flag', on=False) == '/flags/no'
+    with pytest.raises(ValueError):
+        snapshot.dump(router)
+
+
+def test_converters_composition():
+    router = NamedRoutes()
+    router.register('/items/{id:int}', name='item')(endpoint)
+
+    frozen = router.freeze()
+    assert frozen.match_method('/items/12', 'GET').params == {'id': 12}
+    assert frozen.url_for('item', id=12) == '/items/12'
+
+    merged = Routes() + router
+    assert merged.match_method('/items/12', 'GET').params == {'id': 12}
+
+    parent = NamedRoutes()
+    parent.mount('/api', router, namespace='api')
+    assert parent.match_method('/api/items/12', 'GET').params == {'id': 12}
+    assert parent.freeze().match_method(
+        '/api/items/12', 'GET').params == {'id': 12}
+
+    restored = snapshot.loads(snapshot.dumps(router))
+    assert restored.match_method('/items/12', 'GET').params == {'id': 12}
+    assert restored.url_for('item', id=12) == '/items/12'
+
+
+def test_lazy_converters():
+    router = Routes(lazy=True)
+    router.register('/items/{id:int}')(endpoint)
+    route = router.match_method('/items/3', 'GET')
+    assert route.endpoint(None, **route.params) == {'id': 3}
@@ -0,0 +1,169 @@
+import itertools
+import random
+import pytest
+from roughrider.routing.analysis import AMBIGUOUS, analyze
+from roughrider.routing.builder import RoutesBuilder
+from roughrider.routing.components import Routes, NamedRoutes
+
+
+PATHS = [
+    '/',
+    '/about',
+    '/item/{id:digit}',
+    '/item/{id:digit}/edit',
+    '/item/{id:digit}/comments/{cid}',
+    '/user/{name:alpha}',
+    '/tag/{tag:alnum}/',
+    '/file/{name}.json',
+    '/static/{filepath:path}',
+    '/any/{rest:any}',
+    '/hex/{value:[0-9a-f]+}',
+    '/archive/{year:digit}-{month:digit}',
+]
+
+REQUESTS = [
+    '/', '/about', '/about/', '/item/12', '/item/ab', '/item/12/edit',
+    '/item/12/comments/x', '/user/john',
+    '/user/j0hn', '/tag/a1/', '/tag/a1', '/file/doc.json', '/file/doc',
+    '/static/css/main.css', '/any/', '/any/x/y',
+    '/hex/ff0a', '/hex/zz', '/archive/2021-10', '/archive/2021',
+    '/nothing',
+]
+
+
+def build(factory=Routes):
+    router = factory()
+    for i, path in enumerate(PATHS):
+        router.register(path, name=f'route{i}')(lambda request: None)
+    return router
+
+
+def test_frozen_matching():
+    router = build()
+    frozen = router.freeze()
+    for path in REQUESTS:
+        assert frozen.match(path) == router.match(path), path
+
+
+def test_frozen_precedence():
+    router = Routes()
+
+    @router.register('/item/{id}/x')
+    def dynamic(request, id):
+        pass
+
+    @router.register('/item/new/y')
+    def static(request):
+        pass
+
+    frozen = router.freeze()
+    assert frozen.match('/item/new/y')[0]['GET'].endpoint is static
+    # Backtracking on the placeholder.
+    found, params = frozen.match('/item/new/x')
+    assert found['GET'].endpoint is dynamic
+    assert params == {'id': 'new'}
+
+
+def test_frozen_ambiguous_precedence():
+    router = Routes()
+
+    @router.register('/{p:path}')
+    def catchall(request, p):
+        pass
+
+    @router.register('/b/{x:alnum}/a')
+    def nested(request, x):
+        pass
+
+    assert AMBIGUOUS in {issue.kind for issue in analyze(router)}
+    found, params = router.match('/b/a/a')
+    assert found['GET'].endpoint is catchall
+    # The literal segment takes precedence over the catch-all.
+    found, params = router.freeze().match('/b/a/a')
+    assert found['GET'].endpoint is nested
+    assert params == {'x': 'a'}
+    assert router.freeze().match('/c/a/a') == router.match('/c/a/a')
+
+
+def test_frozen_untried_transitions():
+    router = Routes()
+    router.register('/{category:alpha}/{id:digit}')(lambda request: None)
+    router.register('/{slug}')(lambda request: None)
+    assert router.match('/about')[1] == {'slug': 'about'}
+    assert router.freeze().match('/about') == router.match('/about')
+
+    builder = RoutesBuilder(Routes())
+    builder.extend([
+        ('/{category:alpha}/{id:digit}', lambda request: None),
+        ('/{slug}', lambda request: None),
+    ])
+    assert builder.build(freeze=True).match('/about')[1] == {
+        'slug': 'about'}
+
+
+def test_frozen_random_tables():
+    # The trie doesn't backtrack: the frozen table must serve the paths
+    # it serves, the same way. Ambiguous tables resolve by precedence
+    # and the trie matches empty placeholders at times: both are left
+    # out.
+    segments = ('a', 'b', 'ab', '{x}', '{n:digit}', '{w:alpha}',
+                '{m:alnum}', '{p:path}')
+    values = ('a', 'b', 'ab', '1', 'a1', 'c')
+    requests = [
+        '/' + '/'.join(path) for size in (1, 2, 3)
+        for path in itertools.product(values, repeat=size)
+    ]
+    tables = 0
+    for seed in range(200):
+        rng = random.Random(seed)
+        router = Routes()
+        for _ in range(rng.randint(2, 6)):
+            parts = [rng.choice(segments) for _ in range(rng.randint(1, 3))]
+            if '{p:path}' in parts[:-1]:
+                continue
+            names = itertools.count()
+            path = '/' + '/'.join(
+                part.replace('{', f'{{v{next(names)}') for part in parts)
+            router.register(path)(lambda request: None)
+        if any(issue.kind == AMBIGUOUS for issue in analyze(router)):
+            continue
+        tables += 1
+        frozen = router.freeze()
+        for path in requests:
+            found, params = router.match(path)
+            if found is not None and all(params.values()):
+                assert frozen.match(path) == (found, params), path
+    assert tables > 50
+
+
+def test_frozen_read_only():
+    router = build(NamedRoutes)
+    frozen = router.freeze()
+    assert list(frozen) == list(router)
+    assert list(frozen.names_mapping) == list(router.names_mapping)
+    assert frozen.url_for('route2', id=1) == '/item/1'
+
+    with pytest.raises(TypeError) as exc:
+        frozen.register('/other')(lambda request: None)
+    assert str(exc.value) == "Frozen routes can't be modified."
+
+    with pytest.raises(TypeError):
+        frozen += Routes()
+
+    # The original router is not affected.
+    router.register('/other')(lambda request: None)
+    assert frozen.match('/other') == (None, None)
+
+    merged = frozen + router
+    assert merged.match('/other')[0] is not None
+
+
+def test_frozen_patterns():
+    router = Routes()
+    router.register('/file/{name}.{ext}')(lambda request: None)
+    router.register('/hex/{value:[0-9a-f]+}/view')(lambda request: None)
+    frozen = router.freeze()
+
+    assert frozen.match('/file/doc.txt')[1] == {'name': 'doc', 'ext': 'txt'}
+    assert frozen.match('/hex/ff0a/view')[1] == {'value': 'ff0a'}
+    assert frozen.match('/hex/zz/view') == (None, None)
@@ -0,0 +1,114 @@
+import pytest
+import webtest
+from horseman.response import Response
+from roughrider.routing.components import NamedRoutes
+from roughrider.routing.hosts import HostRoutes, hostname
+from tests.conftest import MockRoutingNode
+
+
+def make_router():
+    router = HostRoutes()
+
+    @router.register('/', name='home')
+    def home(request):
+        return 'home'
+
+    @router.host('api.example.com').register('/items/{id}', name='item')
+    def item(request, id):
+        return f'item {id}'
+
+    @router.host('{tenant}.example.com').register(
+        '/users/{name}', name='user')
+    def user(request, tenant, name):
+        return f'{tenant} {name}'
+
+    return router
+
+
+def test_hostname():
+    assert hostname('Example.com:8080') == 'example.com'
+    assert hostname('example.com') == 'example.com'
+    assert hostname('[::1]') == '[::1]'
+    assert hostname('[::1]:80') == '[::1]'
+
+
+def test_host_routing():
+    router = make_router()
+
+    route = router.match_method('/items/1', 'GET', host='api.example.com:80')
+    assert route.params == {'id': '1'}
+    assert route.endpoint(None, **route.params) == 'item 1'
+
+    # Exact hosts take precedence over the patterns.
+    assert router.match_method(
+        '/users/bob', 'GET', host='api.example.com') is None
+
+    route = router.match_method('/users/bob', 'GET', host='ACME.example.com')
+    assert route.params == {'tenant': 'acme', 'name': 'bob'}
+
+    # The routes of the router serve the other hosts.
+    assert router.match_method(
+        '/', 'GET', host='other.org').endpoint(None) == 'home'
+    assert router.match_method('/', 'GET').endpoint(None) == 'home'
+    assert router.match_method(
+        '/items/1', 'GET', host='example.org') is None
+    assert router.match_method(
+        '/', 'GET', host='deep.acme.example.com').endpoint(None) == 'home'
+
+    found, params = router.match('/users/bob', host='acme.example.com')
+    assert params == {'tenant': 'acme', 'name': 'bob'}
+
+
+def test_host_routes():
+    router = HostRoutes()
+    api = router.host('api.example.com')
+    assert router.host('API.example.com') is api
+    assert isinstance(api, NamedRoutes)
+
+    other = NamedRoutes()
+    with pytest.raises(ValueError):
+        router.host('api.example.com', other)
+    assert router.host('www.example.com', other) is other
+
+
+def test_host_url_for():
+    router = make_router()
+    assert router.url_for('home') == '/'
+    assert router.url_for('item', id=1) == '//api.example.com/items/1'
+    assert router.url_for('user', tenant='acme', name='bob', page=2) == \
+        '//acme.example.com/users/bob?page=2'
+
+    with pytest.raises(ValueError):
+        router.url_for('user', name='bob')
+    with pytest.raises(LookupError):
+        router.url_for('unknown')
+
+    # Routes added afterwards are indexed on demand.
+    router.host('api.example.com').register(
+        '/other', name='other')(lambda request: None)
+    assert router.url_for('other') == '//api.example.com/other'
+
+
+def test_frozen_hosts():
+    frozen = make_router().freeze()
+    route = frozen.match_method('/users/bob', 'GET', host='acme.example.com')
+    assert route.params == {'tenant': 'acme', 'name': 'bob'}
+    with pytest.raises(TypeError):
+        frozen.host('api.example.com').register('/x')(lambda request: None)
+
+
+def test_host_node():
+    node = MockRoutingNode()
+    node.routes = make_router()
+
+    def resolve(path, environ):
+        route = node.routes.match_method(
+            path, environ['REQUEST_METHOD'], host=environ['HTTP_HOST'])
+        if route is not None:
+            return Response(200, route.endpoint(None, **route.params))
+
+    node.resolve = resolve
+    app = webtest.TestApp(node)
+    response = app.get('/users/bob', extra_environ={
+        'HTTP_HOST': 'acme.example.com'})
+    assert response.body == b'acme bob'
@@ -0,0 +1,142 @@
+import threading
+import pytest
+from roughrider.routing.components import Routes, MethodNotAllowed
+from roughrider.routing.instruments import TimedEndpoint
+
+
+def make_router(**kwargs):
+    router = Routes(**kwargs)
+
+    @router.register('/item/{id}', methods=['GET', 'PUT'])
+    def item(request, id):
+        return id
+
+    @router.register('/about')
+    def about(request):
+        return 'about'
+
+    return router
+
+
+def test_instrumentation_disabled_by_default():
+    router = make_router()
+    assert router.instruments is None
+    route = router.match_method('/item/1', 'GET')
+    assert route.endpoint.__class__ is not TimedEndpoint
+
+
+def test_instrumentation_counts():
+    router = make_router()
+    instruments = router.instrument()
+    assert router.instrument() is instruments
+
+    for _ in range(3):
+        route = router.match_method('/item/1', 'GET')
+        assert route.endpoint(None, **route.params) == '1'
+    route = router.match_method('/about', 'GET')
+    assert route.endpoint.endpoint.__name__ == 'about'
+    assert router.match_method('/nothing', 'GET') is None
+    with pytest.raises(MethodNotAllowed):
+        router.match_method('/item/2', 'DELETE')
+
+    snapshot = instruments.snapshot()
+    assert snapshot.not_found == 1
+    assert snapshot.not_allowed == 1
+    assert set(snapshot.routes) == {'/item/{id}', '/about'}
+
+    item = snapshot.routes['/item/{id}']
+    assert item.hits == 3
+    assert item.not_allowed == 1
+    assert item.calls == 3
+    assert item.duration > 0
+    assert item.quantile(.99) is not None
+
+    about = snapshot.routes['/about']
+    assert about.hits == 1
+    assert about.calls == 0
+    assert about.quantile(.5) is None
+
+
+def test_instrumentation_buckets():
+    router = make_router()
+    instruments = router.instrument(buckets=[1])
+    route = router.match_method('/about', 'GET')
+    route.endpoint(None)
+    stats = instruments.snapshot().routes['/about']
+    assert stats.histogram == (0, 1)
+    assert stats.quantile(.5) == float('inf')
+
+
+def test_instrumentation_threads():
+    router = make_router(cache_size=10)
+    instruments = router.instrument()
+
+    def requests():
+        for _ in range(100):
+            route = router.match_method('/item/1', 'PUT')
+            route.endpoint(None, **route.params)
+
+    threads = [threading.Thread(target=requests) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = instruments.snapshot().routes['/item/{id}']
+    assert stats.hits == 400
+    assert stats.calls == 400
+
+
+def test_instrumentation_later_routes():
+    router = make_router()
+    instruments = router.instrument()
+
+    @router.register('/other')
+    def other(request):
+        pass
+
+    router.match_method('/other', 'GET')
+    assert instruments.snapshot().routes['/other'].hits == 1
+
+
+def test_uninstrument():
+    router = make_router()
+    router.instrument()
+    router.uninstrument()
+    assert router.instruments is None
+    assert router._resolve == router._lookup
+    route = router.match_method('/about', 'GET')
+    assert route.endpoint.__class__ is not TimedEndpoint
+
+
+def test_instrumentation_options():
+    router = Routes(auto_options=True)
+    for path in ('/a', '/b'):
+        router.register(path)(lambda request: None)
+    # The OPTIONS endpoint is shared by the routes of a same methods set.
+    assert router.match_method('/a', 'OPTIONS').endpoint is \
+        router.match_method('/b', 'OPTIONS').endpoint
+
+    instruments = router.instrument()
+    for path in ('/a', '/b', '/b'):
+        route = router.match_method(path, 'OPTIONS')
+        route.endpoint(None, **route.params)
+    routes = instruments.snapshot().routes
+    assert routes['/a'].hits == 1
+    assert routes['/b'].hits == 2
+    assert routes['/b'].calls == 2
+
+    # The next OPTIONS requests don't look their route definition up.
+    instruments.timed = None
+    instruments.template = None
+    route = router.match_method('/b', 'OPTIONS')
+    assert route.endpoint.path == '/b'
+    route.endpoint(None)
+    assert instruments.snapshot().routes['/b'].hits == 3
+
+    # A route added since may serve the path.
+    del instruments.timed, instruments.template
+    router.register('/{name}')(lambda request: None)
+    assert router.match_method('/c', 'OPTIONS').endpoint.path == '/{name}'
+    router.register('/c')(lambda request: None)
+    assert router.match_method('/c', 'OPTIONS').endpoint.path == '/c'
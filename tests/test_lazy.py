@@ -0,0 +1,127 @@
+import threading
+import pytest
+from horseman.meta import APIView
+from roughrider.routing.builder import RoutesBuilder
+from roughrider.routing.components import Routes, NamedRoutes
+from roughrider.routing.lazy import LazyEndpoint
+from roughrider.routing import snapshot
+
+
+instances = []
+
+
+class View(APIView):
+
+    def __init__(self):
+        instances.append(self)
+
+    def GET(self, request):
+        return 'get'
+
+    def POST(self, request):
+        return 'post'
+
+
+@pytest.fixture(autouse=True)
+def clear_instances():
+    instances.clear()
+
+
+def test_lazy_registration():
+    router = Routes(lazy=True)
+    router.register('/view')(View)
+    assert instances == []
+
+    route = router.match_method('/view', 'POST')
+    assert route.endpoint.endpoint.__class__ is LazyEndpoint
+    assert instances == []
+    assert route.endpoint(None) == 'post'
+    assert len(instances) == 1
+
+    # The payload now holds the actual endpoints.
+    route = router.match_method('/view', 'GET')
+    assert route.endpoint.endpoint.__self__ is instances[0]
+    assert route.endpoint(None) == 'get'
+    assert len(instances) == 1
+
+
+def test_lazy_registration_methods():
+    router = Routes(lazy=True)
+
+    class Callable:
+        def __call__(self, request):
+            return 'called'
+
+    def func(request):
+        return 'func'
+
+    router.register('/callable', methods=['PUT'])(Callable)
+    router.register('/func')(func)
+    with pytest.raises(ValueError):
+        router.register('/unknown', methods=['GOT'])(func)
+    with pytest.raises(AttributeError):
+        router.register('/view', methods=['GET'])(View)
+
+    assert list(router.match('/callable')[0]) == ['PUT']
+    assert router.match_method('/callable', 'PUT').endpoint(None) == 'called'
+    assert router.match_method('/func', 'GET').endpoint(None) == 'func'
+
+
+def test_lazy_registration_threads():
+    router = Routes(lazy=True)
+    router.register('/view')(View)
+    route = router.match_method('/view', 'GET')
+    barrier = threading.Barrier(8)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(route.endpoint(None))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ['get'] * 8
+    assert len(instances) == 1
+
+
+def test_lazy_named_routes():
+    router = NamedRoutes(lazy=True)
+    router.register('/view/{id}', name='view')(View)
+    assert router.url_for('view', id=1) == '/view/1'
+    data = snapshot.dump(router)
+    assert data['routes'] == [['/view/{id}', [
+        ['GET', f'{__name__}:View.GET', 0],
+        ['POST', f'{__name__}:View.POST', 0],
+    ]]]
+    assert data['settings']['lazy'] is True
+
+
+def post_only(view, methods):
+    yield view, ['POST']
+
+
+post_only.methods = lambda view, methods: ['POST']
+
+
+def test_lazy_custom_extractor():
+    def posted(request):
+        return 'posted'
+
+    router = Routes(extractor=post_only, lazy=True)
+    router.register('/posted')(posted)
+    assert list(router.match('/posted')[0]) == ['POST']
+    assert router.dispatch('/posted', 'POST', None) == 'posted'
+
+    builder = RoutesBuilder(Routes(extractor=post_only, lazy=True))
+    builder.register('/posted')(posted)
+    assert builder.build().dispatch('/posted', 'POST', None) == 'posted'
+
+    def extractor(view, methods):
+        yield view, ['POST']
+
+    # The methods of the view can't be known without running it.
+    with pytest.raises(TypeError):
+        Routes(extractor=extractor, lazy=True)
@@ -0,0 +1,154 @@
+import threading
+import pytest
+from horseman.response import Response
+from roughrider.routing.components import NamedRoutes
+from roughrider.routing.hosts import HostRoutes
+from roughrider.routing.live import LiveRoutes, RoutesDiff, diff
+from roughrider.routing.responses import RESPONSES
+from roughrider.routing import snapshot
+
+
+def index(request, **params):
+    return 'index'
+
+
+calls = []
+
+
+def item(request, **params):
+    calls.append(params)
+    return Response(200, b'item')
+
+
+def other(request, **params):
+    return 'other'
+
+
+def build(*extra):
+    router = NamedRoutes(cache_size=10)
+    router.register('/', name='index')(index)
+    router.register('/items/{id}', name='item', cache=60)(item)
+    for path, view in extra:
+        router.register(path)(view)
+    return router
+
+
+def test_diff():
+    old = build(('/about', other))
+    new = build(('/contact', other))
+    assert diff(old, new) == RoutesDiff(
+        added=('/contact',), removed=('/about',), changed=())
+
+    # The endpoints compare as registered.
+    assert not diff(build(), build())
+    assert not diff(build(), snapshot.loads(snapshot.dumps(build())))
+    assert not diff(build(), NamedRoutes(lazy=True) + build())
+
+    changed = build()
+    changed.register('/items/{id}', methods=['POST'])(other)
+    assert diff(build(), changed).changed == ('/items/{id}',)
+
+
+def test_reload():
+    live = LiveRoutes(build())
+    previous = live.routes
+    assert live.dispatch('/', 'GET', None) == 'index'
+    assert live.match_method('/about', 'GET') is None
+
+    changes = live.reload(build(('/about', other)))
+    assert changes.added == ('/about',)
+    assert live.routes is not previous
+    assert live.dispatch('/about', 'GET', None) == 'other'
+    assert live.url_for('item', id=1) == '/items/1'
+    assert sorted(routedef.path for routedef in live) == [
+        '/', '/about', '/items/{id}']
+
+    # Calls in flight resolve on the previous routes.
+    assert previous.match_method('/about', 'GET') is None
+
+    # Nothing changed, nothing is published.
+    current = live.routes
+    assert not live.reload(build(('/about', other)))
+    assert live.routes is current
+
+    with pytest.raises(TypeError):
+        live.reload(object())
+
+
+def test_reload_hosts():
+    def hosted(*paths):
+        router = HostRoutes()
+        router.register('/', name='index')(index)
+        api = router.host('api.example.com')
+        for path in paths:
+            api.register(path)(other)
+        return router
+
+    live = LiveRoutes(hosted('/a'))
+    changes = live.reload(hosted('/a', '/b'))
+    assert changes == RoutesDiff(
+        added=('//api.example.com/b',), removed=(), changed=())
+    assert live.match_method(
+        '/b', 'GET', host='api.example.com') is not None
+    assert not live.reload(snapshot.loads(snapshot.dumps(live.routes)))
+
+
+def test_reload_invalidates_responses():
+    calls.clear()
+    live = LiveRoutes(build())
+    live.dispatch('/items/1', 'GET', None)
+    live.dispatch('/items/1', 'GET', None)
+    assert len(calls) == 1
+
+    changed = NamedRoutes()
+    changed.register('/', name='index')(index)
+    changed.register(
+        '/items/{id}', methods=['GET', 'PUT'], name='item', cache=60)(item)
+    assert live.reload(changed).changed == ('/items/{id}',)
+    live.dispatch('/items/1', 'GET', None)
+    assert len(calls) == 2
+    RESPONSES.clear()
+
+
+def test_reload_invalidates_stale_routes_only():
+    RESPONSES.clear()
+    router = build()
+    router.register('/pages/{id}', cache=60)(item)
+    live = LiveRoutes(router)
+    unchanged = build()
+    for path in ('/items/1', '/pages/1'):
+        live.dispatch(path, 'GET', None)
+    unchanged.dispatch('/items/1', 'GET', None)
+    items = {
+        routes.match_method('/items/1', 'GET').endpoint.endpoint.route
+        for routes in (live, unchanged)
+    }
+    assert len(RESPONSES.backend.routes) == 3
+
+    # The unnamed route is dropped, the same-named routes are kept.
+    assert live.reload(build()) == RoutesDiff(
+        added=(), removed=('/pages/{id}',), changed=())
+    assert set(RESPONSES.backend.routes) == items
+    RESPONSES.clear()
+
+
+def test_reload_while_serving():
+    live = LiveRoutes(build())
+    errors = []
+    done = threading.Event()
+
+    def serve():
+        while not done.is_set():
+            if live.dispatch('/', 'GET', None) != 'index':
+                errors.append('lost')
+
+    threads = [threading.Thread(target=serve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(50):
+        live.reload(build((f'/page{i}', other)))
+    done.set()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert live.match_method('/page49', 'GET') is not None
@@ -0,0 +1,130 @@
+import pytest
+from http import HTTPStatus
+from roughrider.routing.components import Routes, NamedRoutes
+from roughrider.routing.components import MethodNotAllowed
+from roughrider.routing import snapshot
+
+
+def endpoint(request, **params):
+    return params
+
+
+def make_api():
+    api = NamedRoutes()
+    api.register('/items/{id}', methods=['GET', 'PUT'], name='item')(
+        endpoint)
+    api.register('/', name='index')(endpoint)
+    return api
+
+
+def test_mount():
+    router = NamedRoutes()
+    router.register('/', name='home')(endpoint)
+    api = make_api()
+    router.mount('/api/v2/', api, namespace='api')
+
+    route = router.match_method('/api/v2/items/12', 'GET')
+    assert route.path == '/api/v2/items/12'
+    assert route.params == {'id': '12'}
+    assert router.match_method('/api/v2/', 'GET').params == {}
+    assert router.match_method('/api/v2', 'GET') is None
+    assert router.match_method('/api/v2items/12', 'GET') is None
+    assert router.match('/api/v2/items/12')[1] == {'id': '12'}
+
+    with pytest.raises(MethodNotAllowed) as exc:
+        router.match_method('/api/v2/items/12', 'POST')
+    assert exc.value.allow == 'GET, PUT'
+
+    # The routes of the parent take precedence.
+    router.register('/api/v2/items/{id}')(endpoint)
+    assert router.match_method('/api/v2/items/12', 'GET').endpoint.metadata \
+        is None
+
+
+def test_mount_delegation():
+    router = Routes(cache_size=10)
+    api = Routes()
+    router.mount('/api', api)
+    assert router.match_method('/api/late', 'GET') is None
+
+    # Changes of the mounted router apply, the caches are cleared.
+    api.register('/late')(endpoint)
+    assert router.match_method('/api/late', 'GET') is not None
+
+    nested = Routes()
+    nested.register('/deep')(endpoint)
+    api.mount('/nested', nested)
+    assert router.match_method('/api/nested/deep', 'GET') is not None
+
+
+def test_mount_match_many():
+    router = Routes()
+    api = Routes(auto_options=True)
+    api.register('/x/{id:int}')(endpoint)
+    router.mount('/api', api)
+
+    results = list(router.match_many([
+        ('/api/x/5', 'GET'), ('/api/x/5', 'OPTIONS'), ('/api/x/a', 'GET'),
+        ('/api/x/5', 'POST')]))
+    assert results[0].params == {'id': 5}
+    assert results[0].params == router.match_method('/api/x/5', 'GET').params
+    assert router.dispatch('/api/x/5', 'GET', None) == {'id': 5}
+    # The fallback of the mounted router applies.
+    assert results[1].endpoint.method == 'OPTIONS'
+    assert results[2] == HTTPStatus.NOT_FOUND
+    assert results[3] == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+def test_mount_errors():
+    router = NamedRoutes()
+    router.mount('/api', make_api(), namespace='api')
+    with pytest.raises(ValueError):
+        router.mount('/api/', Routes())
+    with pytest.raises(ValueError):
+        router.mount('/', Routes())
+    with pytest.raises(NameError):
+        router.mount('/other', Routes(), namespace='api')
+    with pytest.raises(TypeError):
+        router.mount('/other', object())
+    with pytest.raises(TypeError):
+        router.freeze().mount('/other', Routes())
+
+
+def test_namespaced_url_for():
+    router = NamedRoutes()
+    api = make_api()
+    router.mount('/api/v2', api, namespace='api')
+    assert router.has_route('api:item')
+    assert not router.has_route('api:unknown')
+    assert router.url_for('api:item', id=1) == '/api/v2/items/1'
+    assert router.url_for('api:index') == '/api/v2/'
+    assert router.url_for_many('api:item', id=[1, 2]) == [
+        '/api/v2/items/1', '/api/v2/items/2']
+
+    admin = NamedRoutes()
+    admin.register('/users', name='users')(endpoint)
+    api.mount('/admin', admin, namespace='admin')
+    assert router.url_for('api:admin:users') == '/api/v2/admin/users'
+
+    with pytest.raises(LookupError):
+        router.url_for('api:unknown')
+    with pytest.raises(LookupError):
+        router.url_for('other:item')
+
+
+def test_mount_flattening():
+    router = NamedRoutes()
+    router.mount('/api', make_api(), namespace='api')
+    assert sorted(routedef.path for routedef in router) == [
+        '/api/', '/api/items/{id}']
+
+    frozen = router.freeze()
+    assert frozen.match_method('/api/items/1', 'GET').params == {'id': '1'}
+    assert frozen.url_for('api:item', id=1) == '/api/items/1'
+
+    merged = NamedRoutes() + router
+    assert merged.url_for('api:item', id=1) == '/api/items/1'
+
+    restored = snapshot.loads(snapshot.dumps(router))
+    assert restored.match_method('/api/items/1', 'GET').params == {'id': '1'}
+    assert restored.url_for('api:item', id=1) == '/api/items/1'
@@ -215,3 +215,202 @@ def test_merge_add_operation_decorator_view_class():
             })
         })
     ))
+
+
+def test_url_for():
+    router = NamedRoutes()
+
+    @router.register('/', name="index")
+    def index(request):
+        pass
+
+    @router.register('/item/{id:digit}/{slug}', name="item")
+    def item(request, id, slug):
+        pass
+
+    @router.register('/files/{filepath:path}', name="file")
+    def file(request, filepath):
+        pass
+
+    assert router.url_for('index') == '/'
+    assert router.url_for('item', id=12, slug='my-item') == (
+        '/item/12/my-item')
+    assert router.url_for('item', id=12, slug='été') == (
+        '/item/12/%C3%A9t%C3%A9')
+    assert router.url_for('file', filepath='some dir/file.txt') == (
+        '/files/some%20dir/file.txt')
+    assert router.url_for('item', id=1, slug='a', page=2, tag=['x', 'y']) == (
+        '/item/1/a?page=2&tag=x&tag=y')
+
+
+def test_url_for_errors():
+    router = NamedRoutes()
+
+    @router.register('/item/{id:digit}/{slug}', name="item")
+    def item(request, id, slug):
+        pass
+
+    with pytest.raises(LookupError) as exc:
+        router.url_for('unknown')
+    assert str(exc.value) == "Unknown route `unknown`."
+
+    with pytest.raises(ValueError) as exc:
+        router.url_for('item', id=1)
+    assert str(exc.value) == (
+        "No route found with name item and params {'id': 1}.")
+
+    with pytest.raises(ValueError) as exc:
+        router.url_for('item', id='abc', slug='test')
+    assert str(exc.value) == "Param 'id' does not match 'digit': 'abc'."
+
+    with pytest.raises(ValueError) as exc:
+        router.url_for('item', id=1, slug='a/b')
+    assert str(exc.value) == "Param 'slug' does not match 'string': 'a/b'."
+
+
+def test_url_for_many():
+    router = NamedRoutes()
+
+    @router.register('/item/{id:digit}/{slug}', name="item")
+    def item(request, id, slug):
+        pass
+
+    assert router.url_for_many('item', [
+        {'id': 1, 'slug': 'a'},
+        {'id': 2, 'slug': 'b c', 'page': 3},
+    ]) == ['/item/1/a', '/item/2/b%20c?page=3']
+
+    assert router.url_for_many('item', id=[1, 2], slug=('a', 'b')) == [
+        '/item/1/a', '/item/2/b']
+
+    assert router.url_for_many('item') == []
+
+    with pytest.raises(LookupError):
+        router.url_for_many('unknown', [{}])
+
+    with pytest.raises(ValueError) as exc:
+        router.url_for_many('item', [{'id': 1, 'slug': 'a'}, {'id': 2}])
+    assert str(exc.value) == (
+        "No route found with name item and missing param 'slug'.")
+
+    with pytest.raises(ValueError) as exc:
+        router.url_for_many('item', id=[1, 2], slug=['a'])
+    assert str(exc.value) == 'Params columns differ in length.'
+
+    with pytest.raises(TypeError):
+        router.url_for_many('item', [{'id': 1, 'slug': 'a'}], id=[1])
+
+    @router.register('/about', name="about")
+    def about(request):
+        pass
+
+    assert router.url_for_many('about', page=[1, 2]) == [
+        '/about?page=1', '/about?page=2']
+
+
+def test_merge_in_place():
+    def extractor(view, methods):
+        yield view, ['GET']
+
+    router = NamedRoutes(extractor=extractor, cache_size=10)
+    router1 = NamedRoutes()
+    router2 = NamedRoutes()
+
+    @router1.register('/item/{id}', name="item")
+    def item(request, id):
+        pass
+
+    @router2.register('/about', name="about")
+    def about(request):
+        pass
+
+    router.merge(router1, router2)
+    assert list(router.names_mapping) == [
+        ('item', '/item/{id}'),
+        ('about', '/about'),
+    ]
+    assert router.url_for('item', id=1) == '/item/1'
+    assert router.match_method('/about', 'GET').endpoint.endpoint is about
+
+    router3 = NamedRoutes()
+
+    @router3.register('/contact', methods=['POST'], name="contact")
+    def contact(request):
+        pass
+
+    merged = router
+    merged += router3
+    assert merged is router
+    assert router.has_route('contact')
+
+    added = router + router3
+    assert added.extractor is extractor
+    assert added.cache_info().maxsize == 10
+
+
+def test_merge_name_conflict():
+    router1 = NamedRoutes()
+    router2 = NamedRoutes()
+
+    @router1.register('/view', name="index")
+    def view(request):
+        pass
+
+    @router2.register('/other', name="other")
+    @router2.register('/index', name="index")
+    def other(request):
+        pass
+
+    with pytest.raises(NameError) as exc:
+        router1.merge(router2)
+    assert str(exc.value) == "Route 'index' already exists for path '/view'."
+
+    # Nothing was merged.
+    assert list(router1.names_mapping) == [('index', '/view')]
+    assert router1.match('/other') == (None, None)
+
+    with pytest.raises(TypeError):
+        router1.merge(object())
+
+
+def test_url_for_reserved_names():
+    router = NamedRoutes()
+
+    @router.register('/user/{name}/{params}', name="user")
+    def user(request, name, params):
+        pass
+
+    assert router.url_for('user', name='john', params='x') == '/user/john/x'
+    assert router.url_for_many('user', name=['a'], params=['b']) == [
+        '/user/a/b']
+
+
+def test_compact():
+    router = NamedRoutes(compact=True, auto_options=True)
+
+    def view(request, **params):
+        pass
+
+    router.register('/item/{id}', methods=['GET', 'PUT'], name='item')(view)
+    router.register('/a', tag='shared')(view)
+    router.register('/b', tag='shared')(view)
+    router.register('/c', methods=['PUT', 'GET'], tag='shared')(view)
+
+    # Equal metadata are shared.
+    assert router.match_method('/a', 'GET').endpoint.metadata is \
+        router.match_method('/b', 'GET').endpoint.metadata
+
+    # Payloads of the same methods share their allowance.
+    allowed = router.match_method('/item/1', 'OPTIONS').endpoint
+    assert router.match_method('/c', 'OPTIONS').endpoint is allowed
+
+    # URL builders are compiled on their first use.
+    assert router._urls == {}
+    assert router.url_for('item', id=1) == '/item/1'
+    assert router.url_for_many('item', id=[2]) == ['/item/2']
+    assert list(router._urls) == ['item']
+    assert router.freeze().url_for('item', id=3) == '/item/3'
+    assert (NamedRoutes(compact=True) + router).url_for('item', id=4) == \
+        '/item/4'
+    with pytest.raises(LookupError):
+        router.url_for('unknown')
@@ -0,0 +1,246 @@
+import asyncio
+import threading
+import pytest
+from horseman.http import HTTPError
+from horseman.response import Response
+from roughrider.routing.responses import (
+    RESPONSES, MemoryBackend, FileBackend, ResponseCache)
+from roughrider.routing.components import NamedRoutes
+from roughrider.routing import snapshot
+
+
+calls = []
+
+
+def item(request, **params):
+    calls.append(params)
+    return Response(200, repr(params), {'Content-Type': 'text/plain'})
+
+
+def authenticated(request, **params):
+    if not request:
+        raise HTTPError(401)
+
+
+@pytest.fixture(autouse=True)
+def responses():
+    backend = RESPONSES.backend
+    RESPONSES.backend = MemoryBackend()
+    calls.clear()
+    yield RESPONSES
+    RESPONSES.backend = backend
+
+
+def test_cached_responses():
+    router = NamedRoutes()
+    router.register(
+        '/items/{id:int}', methods=['GET', 'PUT'], name='item', cache=60)(
+            item)
+    first = router.dispatch('/items/1', 'GET', 'request')
+    second = router.dispatch('/items/1', 'GET', 'other')
+    assert second.body == first.body == "{'id': 1}"
+    assert list(second.headers.items()) == [('Content-Type', 'text/plain')]
+    assert router.dispatch('/items/2', 'GET', 'request').body == "{'id': 2}"
+    assert calls == [{'id': 1}, {'id': 2}]
+
+    # Each hit gets its own response.
+    assert second is not first
+    second.cookies['session'] = 'alice'
+    second.headers['X-Other'] = '1'
+    assert list(router.dispatch('/items/1', 'GET', 'other').headers.items()) \
+        == [('Content-Type', 'text/plain')]
+    assert len(calls) == 2
+
+    # Only the GET and HEAD responses are cached.
+    router.dispatch('/items/1', 'PUT', 'request')
+    router.dispatch('/items/1', 'PUT', 'request')
+    assert len(calls) == 4
+
+    router.invalidate('item')
+    router.dispatch('/items/1', 'GET', 'request')
+    assert len(calls) == 5
+    with pytest.raises(LookupError):
+        router.invalidate('unknown')
+
+
+def test_cache_after_guards():
+    router = NamedRoutes()
+    router.register('/', cache=60, guards=[authenticated])(item)
+    router.dispatch('/', 'GET', 'request')
+    with pytest.raises(HTTPError):
+        router.dispatch('/', 'GET', None)
+    assert len(calls) == 1
+
+    with pytest.raises(ValueError):
+        router.register('/invalid', cache='forever')(item)
+
+
+def test_cache_async():
+
+    async def endpoint(request, **params):
+        calls.append(params)
+        return 'ok'
+
+    router = NamedRoutes()
+    router.register('/', cache=60)(endpoint)
+    route = router.match_method('/', 'GET')
+    assert asyncio.run(route.endpoint('request')) == 'ok'
+    assert asyncio.run(route.endpoint('request')) == 'ok'
+    assert len(calls) == 1
+
+
+def test_invalidate_namespaced():
+    api = NamedRoutes()
+    api.register('/items/{id:int}', name='item', cache=60)(item)
+    parent = NamedRoutes()
+    parent.register('/items/{id:int}', name='item', cache=60)(item)
+    parent.mount('/api', api, namespace='api')
+    other = NamedRoutes()
+    other.register('/items/{id:int}', name='item', cache=60)(item)
+    for path in ('/items/1', '/api/items/1'):
+        parent.dispatch(path, 'GET', 'request')
+    other.dispatch('/items/1', 'GET', 'request')
+    assert len(calls) == 3
+
+    # Only the entries of the mounted route are dropped.
+    parent.invalidate('api:item')
+    for path in ('/items/1', '/api/items/1'):
+        parent.dispatch(path, 'GET', 'request')
+    other.dispatch('/items/1', 'GET', 'request')
+    assert len(calls) == 4
+
+    other.invalidate('item')
+    other.dispatch('/items/1', 'GET', 'request')
+    parent.dispatch('/items/1', 'GET', 'request')
+    assert len(calls) == 5
+    with pytest.raises(LookupError):
+        parent.invalidate('api:unknown')
+
+
+def test_memory_backend():
+    backend = MemoryBackend(maxsize=2)
+    route = ('name', 'module:endpoint', 'GET', 0)
+    backend.set((route, (('id', 1),)), 1, 60)
+    backend.set((route, (('id', 2),)), 2, 60)
+    assert backend.get((route, (('id', 1),))) == 1
+    backend.set((route, (('id', 3),)), 3, 60)
+    # The least recently used entry is evicted.
+    assert backend.get((route, (('id', 2),))) is None
+    assert len(backend) == 2
+
+    backend.set((route, (('id', 4),)), 4, -1)
+    assert backend.get((route, (('id', 4),))) is None
+    backend.invalidate(route)
+    assert len(backend) == 0
+    assert backend.routes == {}
+
+
+def test_file_backend(tmp_path):
+    cache = ResponseCache(FileBackend(tmp_path, maxsize=2))
+    route = ('name', 'module:endpoint', 'GET', 0)
+    cache.set((route, ()), {'body': 'shared'}, 60)
+    # Another process, sharing the directory.
+    other = FileBackend(tmp_path)
+    assert other.get((route, ())) == {'body': 'shared'}
+
+    cache.set((route, (('id', 1),)), 1, 60)
+    cache.set(((None, 'module:other', 'GET', 0), ()), 2, 60)
+    assert len(list(tmp_path.glob('*/*'))) == 2
+
+    cache.set((route, (('id', 2),)), 2, -1)
+    assert cache.get((route, (('id', 2),))) is None
+    cache.invalidate(route)
+    assert cache.get((route, (('id', 1),))) is None
+    assert cache.get(((None, 'module:other', 'GET', 0), ())) == 2
+    cache.clear()
+    assert list(tmp_path.glob('*/*')) == []
+
+
+def test_file_backend_eviction(tmp_path):
+    # Scanned once every two writes.
+    backend = FileBackend(tmp_path, maxsize=32)
+    route = ('name', 'module:endpoint', 'GET', 0)
+    for id in range(33):
+        backend.set((route, (('id', id),)), id, 60)
+    assert len(list(tmp_path.glob('*/*'))) == 33
+    backend.set((route, (('id', 33),)), 33, 60)
+    assert len(list(tmp_path.glob('*/*'))) == 32
+
+
+def test_file_backend_unreadable(tmp_path, caplog):
+    backend = FileBackend(tmp_path)
+    key = (('name', 'module:endpoint', 'GET', 0), ())
+    backend.set(key, 1, 60)
+    backend.path(key).write_bytes(b'\x80\x04invalid')
+    assert backend.get(key) is None
+    assert 'Unreadable cached response' in caplog.text
+    assert not backend.path(key).exists()
+    backend.path(key).mkdir()
+    assert backend.get(key) is None
+
+
+def test_cache_reusable_only():
+    router = NamedRoutes()
+
+    @router.register('/stream', cache=60)
+    def stream(request):
+        calls.append('stream')
+        return Response(200, (chunk for chunk in (b'a', b'b')))
+
+    @router.register('/page', cache=60)
+    def page(request):
+        calls.append('page')
+        return Response(200, b'ab')
+
+    assert b''.join(router.dispatch('/stream', 'GET', None)) == b'ab'
+    assert b''.join(router.dispatch('/stream', 'GET', None)) == b'ab'
+    assert calls == ['stream', 'stream']
+    assert router.dispatch('/page', 'GET', None).body == \
+        router.dispatch('/page', 'GET', None).body == b'ab'
+    assert calls.count('page') == 1
+
+    # Nor the cookies of a client, nor the mutable values.
+    @router.register('/login', cache=60)
+    def login(request):
+        calls.append('login')
+        response = Response(200, b'welcome')
+        response.cookies['session'] = 'alice'
+        return response
+
+    @router.register('/data', cache=60)
+    def data(request):
+        calls.append('data')
+        return {'data': 1}
+
+    for _ in range(2):
+        router.dispatch('/login', 'GET', None)
+        router.dispatch('/data', 'GET', None)
+    assert calls.count('login') == calls.count('data') == 2
+
+
+def test_cache_backend_failure(tmp_path):
+
+    class Failing(MemoryBackend):
+        def set(self, key, value, ttl):
+            raise OSError('No space left on device')
+
+    RESPONSES.backend = Failing()
+    router = NamedRoutes()
+    router.register('/', cache=60)(item)
+    assert router.dispatch('/', 'GET', None).body == '{}'
+
+    # The temporary file is removed.
+    backend = FileBackend(tmp_path)
+    with pytest.raises(TypeError):
+        backend.set((('name', 'module:item', 'GET'), ()),
+                    threading.Lock(), 60)
+    assert not [entry for entry in tmp_path.rglob('*') if entry.is_file()]
+
+
+def test_cache_snapshot():
+    router = NamedRoutes()
+    router.register('/items/{id:int}', name='item', cache=60)(item)
+    restored = snapshot.loads(snapshot.dumps(router))
+    first = restored.dispatch('/items/1', 'GET', 'request')
+    assert restored.dispatch('/items/1', 'GET', 'request').body == first.body
+    assert len(calls) == 1
@@ -1,4 +1,7 @@
-from roughrider.routing.components import Routes
+import pytest
+import horseman.http
+from http import HTTPStatus
+from roughrider.routing.components import Routes, MethodNotAllowed
 from roughrider.routing.meta import RouteDefinition, RouteEndpoint
 
 
@@ -108,3 +111,254 @@ def test_override_method_registration_operation():
             }
         )
     ]
+
+
+def test_static_routes_index():
+    router = Routes()
+
+    @router.register('/item/{id}')
+    def item(request, id):
+        pass
+
+    @router.register('/item/new')
+    def new_item(request):
+        pass
+
+    # The literal path wins over the earlier placeholder.
+    found, params = router.match('/item/new')
+    assert found['GET'].endpoint is new_item
+    assert params == {}
+
+    found, params = router.match('/item/12')
+    assert found['GET'].endpoint is item
+    assert params == {'id': '12'}
+
+    router2 = Routes()
+
+    @router2.register('/item/new', methods=['POST'])
+    def create_item(request):
+        pass
+
+    router3 = router + router2
+    route = router3.match_method('/item/new', 'POST')
+    assert route.endpoint.endpoint is create_item
+    assert route.params == {}
+    assert router3.match_method('/item/new', 'GET').endpoint.endpoint is (
+        new_item)
+
+
+def test_method_not_allowed():
+
+    router = Routes()
+
+    @router.register('/item/{id}', methods=['POST', 'GET'])
+    def item(request, id):
+        pass
+
+    with pytest.raises(MethodNotAllowed) as exc:
+        router.match_method('/item/1', 'DELETE')
+    assert exc.value.status == 405
+    assert exc.value.headers == {'Allow': 'GET, POST'}
+
+    with pytest.raises(MethodNotAllowed):
+        router.match_method('/item/1', 'HEAD')
+
+
+def test_unknown_methods():
+    router = Routes(auto_options=True)
+
+    def purge(request):
+        pass
+
+    router.add('/x', {'PURGE': RouteEndpoint('PURGE', purge)})
+    assert router.match_method('/x', 'PURGE').endpoint.endpoint is purge
+    with pytest.raises(MethodNotAllowed) as exc:
+        router.match_method('/x', 'GET')
+    assert exc.value.allow == 'OPTIONS, PURGE'
+
+    class Collection:
+
+        def propfind(self, request):
+            pass
+
+    def extractor(view, methods):
+        yield view().propfind, ['PROPFIND']
+
+    router = Routes(extractor=extractor)
+    router.register('/dav')(Collection)
+    assert router.match_method('/dav', 'PROPFIND') is not None
+    with pytest.raises(MethodNotAllowed) as exc:
+        router.match_method('/dav', 'OPTIONS')
+    assert exc.value.allow == 'PROPFIND'
+
+
+def test_automatic_head_and_options():
+
+    router = Routes(auto_head=True, auto_options=True, cache_size=10)
+
+    @router.register('/item/{id}', methods=['GET', 'PUT'])
+    def item(request, id):
+        pass
+
+    @router.register('/form', methods=['POST'])
+    def form(request):
+        pass
+
+    route = router.match_method('/item/1', 'HEAD')
+    assert route.endpoint.endpoint is item
+    assert route.params == {'id': '1'}
+
+    route = router.match_method('/item/1', 'OPTIONS')
+    response = route.endpoint(None, **route.params)
+    assert response.status == 204
+    assert response.headers['Allow'] == 'GET, HEAD, OPTIONS, PUT'
+    response.headers['X-Other'] = '1'
+    # The endpoint is shared with the routers of the same allowance.
+    other = Routes(auto_head=True, auto_options=True)
+    other.register('/item', methods=['GET', 'PUT'])(item)
+    response = other.match_method('/item', 'OPTIONS').endpoint(None)
+    assert dict(response.headers) == {'Allow': 'GET, HEAD, OPTIONS, PUT'}
+    response = router.match_method('/item/2', 'OPTIONS').endpoint(None)
+    assert dict(response.headers) == {'Allow': 'GET, HEAD, OPTIONS, PUT'}
+
+    with pytest.raises(MethodNotAllowed) as exc:
+        router.match_method('/form', 'HEAD')
+    assert exc.value.headers == {'Allow': 'OPTIONS, POST'}
+
+    frozen = router.freeze()
+    assert frozen.auto_head and frozen.auto_options
+    assert frozen.match_method('/item/1', 'HEAD').endpoint.endpoint is item
+    with pytest.raises(MethodNotAllowed) as exc:
+        frozen.match_method('/item/1', 'DELETE')
+    assert exc.value.allow == 'GET, HEAD, OPTIONS, PUT'
+
+
+def test_match_many():
+    router = Routes(auto_head=True)
+
+    @router.register('/item/{id}', methods=['GET', 'PUT'])
+    def item(request, id):
+        pass
+
+    @router.register('/about')
+    def about(request):
+        pass
+
+    requests = [
+        ('/item/1', 'GET'),
+        ('/item/1', 'PUT'),
+        ('/item/1', 'DELETE'),
+        ('/nothing', 'GET'),
+        ('/about', 'HEAD'),
+        ('/item/1', 'GET'),
+        ('/item/2', 'GET'),
+    ]
+    results = router.match_many(iter(requests))
+    assert not isinstance(results, list)
+    results = list(results)
+    assert [getattr(result, 'path', result) for result in results] == [
+        '/item/1', '/item/1', HTTPStatus.METHOD_NOT_ALLOWED,
+        HTTPStatus.NOT_FOUND, '/about', '/item/1', '/item/2',
+    ]
+    assert results[0].params == {'id': '1'}
+    assert results[1].endpoint.method == 'PUT'
+    assert results[4].endpoint.method == 'GET'
+    # Identical requests share the route.
+    assert results[5] is results[0]
+    assert results[6].params == {'id': '2'}
+    assert list(router.match_many(requests, memo_size=2)) == results
+
+    for request, result in zip(requests, router.match_many(requests)):
+        try:
+            expected = router.match_method(*request)
+        except horseman.http.HTTPError as exc:
+            expected = exc.status
+        if expected is None:
+            expected = HTTPStatus.NOT_FOUND
+        assert result == expected
+
+
+def test_dispatch():
+    router = Routes(auto_head=True)
+
+    @router.register('/item/{id:int}', methods=['GET', 'PUT'])
+    def item(request, id):
+        return request, id
+
+    @router.register('/about')
+    def about(request):
+        return request
+
+    request = object()
+    assert router.dispatch('/about', 'GET', request) is request
+    assert router.dispatch('/about', 'HEAD', request) is request
+    assert router.dispatch('/item/1', 'PUT', request) == (request, 1)
+    assert router.dispatch('/nothing', 'GET', request) is None
+    assert router.dispatch('/item/a', 'GET', request) is None
+    with pytest.raises(MethodNotAllowed):
+        router.dispatch('/item/1', 'DELETE', request)
+
+    cached = Routes(cache_size=10)
+    cached.register('/about')(about)
+    assert cached.dispatch('/about', 'GET', request) is request
+    assert cached.dispatch('/about', 'GET', request) is request
+    assert cached.cache_info().hits == 1
+
+    instruments = router.instrument()
+    assert router.dispatch('/item/2', 'GET', request) == (request, 2)
+    assert instruments.snapshot().routes['/item/{id:digit}'].calls == 1
+
+
+def test_query():
+    router = Routes()
+
+    def view(request, **params):
+        pass
+
+    paths = [
+        '/', '/a/{id:digit}/x', '/a/{cid:digit}/y', '/ab', '/a/{name}',
+        '/about', '/b/c']
+    for path in paths:
+        router.register(path, methods=['GET'])(view)
+    router.register('/b/d', methods=['POST'], tag='admin')(view)
+    api = Routes()
+    api.register('/items', tag='admin')(view)
+    router.mount('/api', api)
+
+    assert sorted(routedef.path for routedef in router) == sorted(
+        paths + ['/b/d', '/api/items'])
+    assert sorted(routedef.path for routedef in router.query('/a')) == [
+        '/a/{cid:digit}/y', '/a/{id:digit}/x', '/a/{name}', '/ab', '/about',
+        '/api/items']
+    assert sorted(routedef.path for routedef in router.query('/a/')) == [
+        '/a/{cid:digit}/y', '/a/{id:digit}/x', '/a/{name}']
+    assert [routedef.path for routedef in router.query('/a/{cid')] == [
+        '/a/{cid:digit}/y']
+    assert [routedef.path for routedef in router.query('/b/', 'POST')] == [
+        '/b/d']
+    assert sorted(routedef.path for routedef in router.query(key='tag')) == [
+        '/api/items', '/b/d']
+    assert [routedef.path for routedef in router.query('/api/it')] == [
+        '/api/items']
+    assert [routedef.path for routedef in router.query('/ap')] == [
+        '/api/items']
+    assert list(router.query('/nothing')) == []
+
+    frozen = router.freeze()
+    assert sorted(routedef.path for routedef in frozen.query('/a/')) == [
+        '/a/{cid:digit}/y', '/a/{id:digit}/x', '/a/{name}']
+
+
+def test_iteration_depth():
+    # The traversal doesn't recurse: deep trees are walked.
+    router = Routes()
+
+    def view(request, **params):
+        pass
+
+    path = ''
+    for i in range(300):
+        path += f'/s{i}'
+        router.register(path)(view)
+    assert sum(1 for _ in router) == 300
+    assert len(list(router.query('/s0/s1/s2/'))) == 297
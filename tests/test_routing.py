@@ -3,6 +3,8 @@ import webtest
 import pytest
 import horseman.http
 import horseman.response
+from roughrider.routing.wsgi import RoutingNode
+from tests.conftest import MockRoutingNode
 
 
 def test_resolve(node):
@@ -38,3 +40,24 @@ def test_wsgi_roundtrip(node):
     response = app.post('/getter', status=405)
     assert response.body == (
         b'Specified method is invalid for this resource')
+
+
+class AllowingNode(RoutingNode, MockRoutingNode):
+    pass
+
+
+def test_wsgi_allow_header():
+    node = AllowingNode()
+    app = webtest.TestApp(node)
+    response = app.get('/getter', status=404)
+    assert response.body == b'Nothing matches the given URI'
+
+    @node.routes.register('/getter', methods=['GET', 'PUT'])
+    def fake_route(request):
+        return horseman.response.Response(200, body=b'OK !')
+
+    assert app.get('/getter').body == b'OK !'
+    response = app.post('/getter', status=405)
+    assert response.body == (
+        b'Specified method is invalid for this resource')
+    assert response.headers['Allow'] == 'GET, PUT'
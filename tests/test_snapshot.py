@@ -0,0 +1,99 @@
+import json
+import pytest
+from horseman.meta import APIView
+from roughrider.routing.components import Routes, NamedRoutes
+from roughrider.routing.hosts import HostRoutes
+from roughrider.routing import snapshot
+
+
+def index(request):
+    pass
+
+
+def item(request, id):
+    pass
+
+
+class Document(APIView):
+
+    def GET(self, request, id):
+        pass
+
+    def PUT(self, request, id):
+        pass
+
+
+def build():
+    router = NamedRoutes(cache_size=100)
+    router.register('/', name='index')(index)
+    router.register('/item/{id:digit}', methods=['GET', 'POST'])(item)
+    router.register('/document/{id}', name='document')(Document)
+    return router
+
+
+def test_snapshot_roundtrip():
+    router = build()
+    data = snapshot.dump(router)
+    assert data['routes'] == [
+        ['/', [['GET', 'test_snapshot:index', 0]]],
+        ['/item/{id:digit}', [
+            ['GET', 'test_snapshot:item', None],
+            ['POST', 'test_snapshot:item', None],
+        ]],
+        ['/document/{id}', [
+            ['GET', 'test_snapshot:Document.GET', 1],
+            ['PUT', 'test_snapshot:Document.PUT', 1],
+        ]],
+    ]
+    assert data['metadata'] == [{'name': 'index'}, {'name': 'document'}]
+
+    restored = snapshot.loads(json.dumps(data))
+    assert restored.__class__ is NamedRoutes
+    assert restored.cache_info().maxsize == 100
+    assert list(restored.names_mapping) == list(router.names_mapping)
+    assert restored.url_for('document', id='a') == '/document/a'
+
+    route = restored.match_method('/item/1', 'POST')
+    assert route.endpoint.endpoint is item
+    assert route.params == {'id': '1'}
+
+    get = restored.match_method('/document/1', 'GET').endpoint
+    put = restored.match_method('/document/1', 'PUT').endpoint
+    assert get.endpoint.__func__ is Document.GET
+    assert get.endpoint.__self__ is put.endpoint.__self__
+    assert get.metadata is put.metadata
+
+
+def test_snapshot_hosts():
+    router = HostRoutes()
+    router.register('/', name='index')(index)
+    router.host('api.example.com').register(
+        '/item/{id:digit}', name='item')(item)
+    router.host('{tenant}.example.com').register(
+        '/document/{id}', name='document')(Document)
+
+    restored = snapshot.loads(snapshot.dumps(router))
+    assert restored.match_method(
+        '/item/1', 'GET', host='api.example.com').endpoint.endpoint is item
+    assert restored.match_method(
+        '/document/1', 'PUT', host='acme.example.com').params == {
+            'tenant': 'acme', 'id': '1'}
+    assert restored.url_for('document', tenant='acme', id=1) == \
+        '//acme.example.com/document/1'
+
+
+def test_snapshot_not_importable():
+    router = Routes()
+
+    @router.register('/')
+    def local(request):
+        pass
+
+    with pytest.raises(ValueError):
+        snapshot.dumps(router)
+
+
+def test_snapshot_format():
+    with pytest.raises(ValueError) as exc:
+        snapshot.load({'format': 0})
+    assert str(exc.value) == 'Unsupported snapshot format: 0.'
@@ -1,7 +1,7 @@
 import hamcrest
 import pytest
 from horseman.meta import APIView
-from roughrider.routing.utils import get_routables
+from roughrider.routing.utils import get_routables, view_methods
 
 
 def view_func(request):
@@ -119,3 +119,35 @@ def test_view_instance_payload():
 
     assert str(exc.value) == (
         'Registration of APIView does not accept methods.')
+
+
+def test_view_methods_introspection():
+
+    class Base(APIView):
+
+        def GET(self, request):
+            pass
+
+        @classmethod
+        def PUT(cls, request):
+            pass
+
+        @staticmethod
+        def DELETE(request):
+            pass
+
+        post = GET
+
+    class Derived(Base):
+
+        def POST(self, request):
+            pass
+
+    assert view_methods(Base) == ('GET', 'PUT')
+    assert view_methods(Derived) == ('GET', 'POST', 'PUT')
+    assert view_methods(Derived) is view_methods(Derived)
+
+    inst = Derived()
+    payload = list(get_routables(inst))
+    assert [verbs for _, verbs in payload] == [['GET'], ['POST'], ['PUT']]
+    assert payload[0][0].__func__ is Base.GET